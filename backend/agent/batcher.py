@@ -0,0 +1,152 @@
+"""Micro-batching of concurrent LLM calls."""
+
+import asyncio
+import logging
+from typing import Any
+
+from langchain_core.messages import BaseMessage, BaseMessageChunk, message_chunk_to_message
+from langchain_core.runnables import Runnable, RunnableConfig
+
+logger = logging.getLogger(__name__)
+
+_Request = tuple[list[BaseMessage], RunnableConfig | None, asyncio.Future]
+
+
+class LLMBatcher:
+    """
+    Collect LLM calls arriving within a short window and send them as one batch.
+
+    Follows a LazyBatching-style policy: a lone request is dispatched at
+    once, so an idle server adds no latency. Only when other requests are
+    already queued behind it does the batcher wait ``batch_window_ms`` for
+    more, and a backlog of ``flush_threshold`` skips the wait (bounding tail
+    latency). A batch of one is streamed with ``astream``, so token callbacks
+    (e.g. LangGraph's ``stream_mode="messages"``) see output as soon as it is
+    decoded.
+    """
+
+    def __init__(
+        self,
+        llm: Runnable,
+        batch_window_ms: float = 10.0,
+        max_batch: int = 16,
+        flush_threshold: int = 8,
+    ) -> None:
+        """
+        Initialize the batcher.
+
+        Args:
+            llm: Runnable to call (typically the tool-bound chat model)
+            batch_window_ms: How long to wait for more requests before flushing
+            max_batch: Maximum number of requests per batch
+            flush_threshold: Queue depth at which to flush without waiting
+        """
+        self.llm = llm
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self.flush_threshold = flush_threshold
+
+        self._queue: asyncio.Queue[_Request] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._dispatches: set[asyncio.Task] = set()
+
+    async def submit(
+        self, messages: list[BaseMessage], config: RunnableConfig | None = None
+    ) -> Any:
+        """
+        Queue a request and wait for its response.
+
+        Args:
+            messages: Messages to send to the LLM
+            config: Runnable config of the caller, so callbacks and tracing
+                attach to the caller's run rather than the batcher's task
+
+        Returns:
+            The LLM response for these messages
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # First use, or the previous loop is gone (e.g. sync invoke())
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect(self._queue))
+
+        future = loop.create_future()
+        await self._queue.put((messages, config, future))
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue[_Request]) -> None:
+        """
+        Gather queued requests into batches and dispatch them.
+
+        Args:
+            queue: Queue of pending (messages, config, future) requests
+        """
+        while True:
+            batch = [await queue.get()]
+
+            # Wait for stragglers only under concurrent load; with nothing else
+            # queued the window would just delay the one request
+            if 0 < queue.qsize() < self.flush_threshold:
+                await asyncio.sleep(self.batch_window)
+
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            # Dispatch in the background so the next window starts immediately
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _stream(self, messages: list[BaseMessage], config: RunnableConfig | None) -> Any:
+        """
+        Stream a single request and accumulate the chunks into one message.
+
+        Args:
+            messages: Messages to send to the LLM
+            config: Runnable config of the caller
+
+        Returns:
+            The complete response message
+        """
+        response: BaseMessageChunk | None = None
+        async for chunk in self.llm.astream(messages, config):
+            response = chunk if response is None else response + chunk
+
+        if response is None:
+            raise RuntimeError("LLM returned an empty stream")
+        return message_chunk_to_message(response)
+
+    async def _dispatch(self, batch: list[_Request]) -> None:
+        """
+        Send a batch to the LLM and resolve each request's future.
+
+        Args:
+            batch: Queued (messages, config, future) requests
+        """
+        pending = [request for request in batch if not request[2].done()]
+        if not pending:
+            return
+
+        try:
+            if len(pending) == 1:
+                messages, config, _ = pending[0]
+                results: list[Any] = [await self._stream(messages, config)]
+            else:
+                logger.debug("Sending batch of %d LLM request(s)", len(pending))
+                results = await self.llm.abatch(
+                    [messages for messages, _, _ in pending],
+                    [config or {} for _, config, _ in pending],
+                    return_exceptions=True,
+                )
+        except Exception as e:
+            results = [e] * len(pending)
+
+        for (_, _, future), result in zip(pending, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -1,27 +1,212 @@
-"""LangGraph agent implementation with HITL support."""
+"""
+LangGraph agent implementation with HITL support.
 
-import logging
-from typing import Any, Literal
+Graph nodes run on the server's event loop. Keep them non-blocking: use the
+async variant of a library call where one exists, and wrap anything that is
+only available synchronously (file I/O, sync DB/audit clients, CPU-heavy
+work) in ``await asyncio.to_thread(fn, *args)`` instead of calling it inline.
+"""
 
-from langchain_core.messages import AIMessage, HumanMessage
+import asyncio
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Final, Literal
+
+import httpx
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolCall,
+    ToolMessage,
+    get_buffer_string,
+)
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
-from langgraph.prebuilt import ToolNode
-from langgraph.types import interrupt
+from langgraph.types import StateSnapshot
 
+from backend.agent.batcher import LLMBatcher
+from backend.agent.serde import OrjsonSerializer
 from backend.agent.state import AgentState
+from backend.agent.tool_node import ParallelToolNode
 
 logger = logging.getLogger(__name__)
 
+
+class NoPendingApprovalError(RuntimeError):
+    """Raised when resuming a thread that is not waiting for approval."""
+
+
 # Tools that require human approval before execution
 # Format: {server_name}_{tool_name}
-SENSITIVE_TOOLS = {
-    "splunk-mcp_run_splunk_query",  # Splunk SPL queries
-    "splunk-mcp_run_query",  # Alternative Splunk query tool
-    "splunk-mcp_execute_query",  # Alternative Splunk query tool
-    # Add more sensitive tools as needed based on /mcp output
-}
+SENSITIVE_TOOLS: Final[frozenset[str]] = frozenset(
+    {
+        "splunk-mcp_run_splunk_query",  # Splunk SPL queries
+        "splunk-mcp_run_query",  # Alternative Splunk query tool
+        "splunk-mcp_execute_query",  # Alternative Splunk query tool
+        # Add more sensitive tools as needed based on /mcp output
+    }
+)
+
+# Name patterns for families of sensitive tools, as (kind, value) where kind
+# is "exact", "prefix", or "suffix". Compiled once by build_sensitive_matcher.
+SENSITIVE_PATTERNS: Final[tuple[tuple[str, str], ...]] = (
+    *(("exact", name) for name in sorted(SENSITIVE_TOOLS)),
+    ("suffix", "_execute_sql"),  # Any SQL execution tool
+)
+
+# Sensitive tools that are read-only and safe to start while the human is
+# still reviewing them. Results are only used if the call is approved as-is.
+SPECULATIVE_TOOLS: Final[frozenset[str]] = frozenset(
+    {
+        "splunk-mcp_run_splunk_query",
+        "splunk-mcp_run_query",
+    }
+)
+
+# In-flight speculative tool calls per thread: {thread_id: {tool_call_id: task}}.
+# Tasks can't be checkpointed, so they live here until the thread is resumed.
+_SPECULATIVE_CACHE_SIZE = 256
+_speculative_calls: OrderedDict[str, dict[str, asyncio.Task]] = OrderedDict()
+
+# Tool-bound LLMs keyed by (event loop, model_name, tool identities, ...).
+# Binding tools re-generates every tool's JSON schema, so agents created with
+# the same tool list share the result instead of rebuilding it. The HTTP/2
+# client is bound to the loop it first runs on, hence the loop in the key.
+# Compiled graphs are not shared: their nodes are bound methods of the agent.
+# The tools are stored alongside so their ids can't be reused by another tool
+# set while the entry exists.
+_LLM_CACHE_SIZE = 8
+_llm_cache: OrderedDict[tuple, tuple[tuple[BaseTool, ...], Any, Any, LLMBatcher, Any]] = (
+    OrderedDict()
+)
+
+# Event loop running invoke() for agents whose own loop isn't running. It
+# lives as long as the process, so loop-bound state created by one call (HTTP
+# connections, checkpointer connections) is still usable by the next.
+_sync_loop: asyncio.AbstractEventLoop | None = None
+_sync_loop_lock = threading.Lock()
+
+
+# OpenAI function-calling schemas keyed by (tool name, description, args
+# schema identity). The args schema is stored alongside so its id can't be
+# reused by another class while the entry exists.
+_tool_schema_cache: dict[tuple[str, str, int], tuple[Any, dict[str, Any]]] = {}
+
+
+def _openai_tool_schema(tool: BaseTool) -> dict[str, Any]:
+    """
+    Get the OpenAI tool schema for a tool, converting it only once.
+
+    Args:
+        tool: Tool to convert
+
+    Returns:
+        OpenAI function-calling tool definition
+    """
+    key = (tool.name, tool.description, id(tool.args_schema))
+    cached = _tool_schema_cache.get(key)
+    if cached is None:
+        cached = (tool.args_schema, convert_to_openai_tool(tool))
+        _tool_schema_cache[key] = cached
+    return cached[1]
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the background event loop used by ``SplunkMCPAgent.invoke``.
+
+    Returns:
+        Event loop running in a daemon thread (uvloop where available, like
+        the server)
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            loop: asyncio.AbstractEventLoop | None = None
+            if sys.platform != "win32":
+                try:
+                    import uvloop
+
+                    loop = uvloop.new_event_loop()
+                except ImportError:
+                    pass
+            loop = loop or asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="agent-invoke", daemon=True).start()
+            _sync_loop = loop
+    return _sync_loop
+
+
+def build_sensitive_matcher(
+    patterns: tuple[tuple[str, str], ...] = SENSITIVE_PATTERNS,
+) -> Callable[[str], bool]:
+    """
+    Compile sensitive tool name patterns into a single matcher.
+
+    Args:
+        patterns: (kind, value) pairs with kind "exact", "prefix", or "suffix"
+
+    Returns:
+        Function returning True if a tool name requires approval
+
+    Raises:
+        ValueError: If a pattern kind is not supported
+    """
+    exact: set[str] = set()
+    prefixes: list[str] = []
+    suffixes: list[str] = []
+    for kind, value in patterns:
+        if kind == "exact":
+            exact.add(value)
+        elif kind == "prefix":
+            prefixes.append(value)
+        elif kind == "suffix":
+            suffixes.append(value)
+        else:
+            raise ValueError(f"Unsupported sensitive tool pattern kind: {kind}")
+
+    exact_names = frozenset(exact)
+    prefix_tuple = tuple(prefixes)
+    suffix_tuple = tuple(suffixes)
+
+    def matches(name: str) -> bool:
+        return name in exact_names or name.startswith(prefix_tuple) or name.endswith(suffix_tuple)
+
+    return matches
+
+
+def categorize_tools(tools: list[BaseTool]) -> dict[str, list[BaseTool]]:
+    """
+    Group tools into "mcp", "rag", and "other" categories.
+
+    MCP tools are named ``<server>_<tool>`` with a hyphenated server name;
+    RAG tools retrieve or search documents.
+
+    Args:
+        tools: Tools to categorize
+
+    Returns:
+        Dictionary mapping category to tools, in registration order
+    """
+    categories: dict[str, list[BaseTool]] = {"mcp": [], "rag": [], "other": []}
+    for tool in tools:
+        name = tool.name
+        lname = name.lower()
+        if "-" in name and "_" in name:
+            categories["mcp"].append(tool)
+        elif "retrieve" in lname or "search" in lname:
+            categories["rag"].append(tool)
+        else:
+            categories["other"].append(tool)
+    return categories
 
 
 class SplunkMCPAgent:
@@ -41,35 +226,190 @@ class SplunkMCPAgent:
         tools: list[BaseTool],
         model_name: str = "gpt-4o",
         checkpoint_path: str = "./data/checkpoints/agent.db",
+        checkpointer_backend: str = "sqlite",
+        max_context_messages: int = 20,
+        summarize_threshold: int = 10,
+        summary_model_name: str = "gpt-4o-mini",
     ) -> None:
         """
         Initialize the agent.
 
+        The SQLite and Postgres checkpointers bind to the running event loop,
+        so the agent must be constructed from async code (e.g. app startup)
+        unless ``checkpoint_path`` is ``":memory:"``.
+
         Args:
             tools: List of tools available to the agent
             model_name: OpenAI model to use
-            checkpoint_path: Path to SQLite checkpoint database
+            checkpoint_path: Path to SQLite checkpoint database, Postgres
+                connection string, or ":memory:" for an in-memory checkpointer
+            checkpointer_backend: Checkpoint backend ("sqlite" or "postgres")
+            max_context_messages: Maximum number of messages sent to the LLM
+                before older ones are replaced by a summary
+            summarize_threshold: Minimum number of messages outside the window
+                before they are summarized (otherwise the full history is sent)
+            summary_model_name: OpenAI model used to summarize older messages
         """
-        self.tools = tools
         self.model_name = model_name
+        self.summary_model_name = summary_model_name
         self.checkpoint_path = checkpoint_path
-
-        # Initialize LLM with tools
-        self.llm = ChatOpenAI(model_name=model_name, temperature=0)
-        self.llm_with_tools = self.llm.bind_tools(tools)
+        self.checkpointer_backend = checkpointer_backend
+        self.max_context_messages = max_context_messages
+        self.summarize_threshold = summarize_threshold
+        # Loop the agent's loop-bound state belongs to; None until first use
+        # when constructed from sync code
+        try:
+            self._loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        self._sensitive_matcher = build_sensitive_matcher()
 
         # Create checkpointer for persistence
-        from langgraph.checkpoint.memory import MemorySaver
+        self.checkpointer = self._create_checkpointer()
+
+        self.set_tools(tools)
+
+        logger.info("Initialized SplunkMCPAgent with %d tools and model %s", len(tools), model_name)
+
+    def set_tools(self, tools: list[BaseTool]) -> None:
+        """
+        Replace the agent's tools.
 
-        self.checkpointer = MemorySaver()
-        logger.info(
-            "Using in-memory checkpointer (conversation state will not persist across restarts)"
+        Rebinds the LLM to the new tool schemas and rebuilds the graph.
+        Threads keep their checkpointed state; runs already in progress
+        finish with the tools they started with.
+
+        Args:
+            tools: List of tools available to the agent
+        """
+        self.tools = tools
+        self._tools_by_name: dict[str, BaseTool] = {t.name: t for t in tools}
+        self.tools_by_category = categorize_tools(tools)
+        # Match the registered tools once so per-call checks are set lookups
+        self._sensitive_tool_names = frozenset(
+            name for name in self._tools_by_name if self._sensitive_matcher(name)
+        )
+
+        # Reuse the bound LLM of an agent with the same loop, model and tools
+        sorted_tools = tuple(sorted(tools, key=lambda t: (t.name, id(t))))
+        cache_key = (
+            self._loop,
+            self.model_name,
+            tuple((t.name, id(t)) for t in sorted_tools),
+            self.summary_model_name,
         )
+        cached = _llm_cache.get(cache_key)
+        if cached is not None and any(
+            a is not b for a, b in zip(cached[0], sorted_tools, strict=True)
+        ):
+            cached = None
+        if cached is None:
+            # Initialize LLM with tools. The HTTP/2 client multiplexes
+            # concurrent requests over pooled connections, and streaming lets
+            # token events flow while a response is still being generated.
+            llm = ChatOpenAI(
+                model=self.model_name,
+                temperature=0,
+                streaming=True,
+                max_retries=2,
+                http_async_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=128,
+                        max_keepalive_connections=64,
+                        keepalive_expiry=30.0,
+                    ),
+                    timeout=httpx.Timeout(60.0, connect=5.0),
+                ),
+            )
+            # Same as bind_tools(), but with the schemas converted once per tool
+            llm_with_tools = llm.bind(tools=[_openai_tool_schema(t) for t in tools])
+
+            # Summaries are internal, so keep their tokens out of message streams
+            summarizer = ChatOpenAI(model=self.summary_model_name, temperature=0).with_config(
+                tags=["nostream"]
+            )
+
+            cached = (sorted_tools, llm, llm_with_tools, LLMBatcher(llm_with_tools), summarizer)
+            _llm_cache[cache_key] = cached
+            for key in [key for key in _llm_cache if key[0] is not None and key[0].is_closed()]:
+                del _llm_cache[key]
+            if len(_llm_cache) > _LLM_CACHE_SIZE:
+                _llm_cache.popitem(last=False)
+        else:
+            _llm_cache.move_to_end(cache_key)
+            logger.debug("Reusing bound LLM for identical model and tool set")
+
+        _, self.llm, self.llm_with_tools, self._batcher, self._summarizer = cached
+
+        # Build the graph; its nodes are bound to this agent
+        self.graph: Any = self._build_graph()
+
+    def _create_checkpointer(self) -> Any:  # Returns BaseCheckpointSaver
+        """
+        Create the checkpointer for the configured backend.
+
+        Returns:
+            Checkpoint saver passed to the compiled graph
+
+        Raises:
+            ValueError: If the checkpointer backend is not supported
+        """
+        if self.checkpoint_path == ":memory:":
+            from langgraph.checkpoint.memory import MemorySaver
+
+            logger.info(
+                "Using in-memory checkpointer (conversation state will not persist across restarts)"
+            )
+            return MemorySaver(serde=OrjsonSerializer())
+
+        if self.checkpointer_backend == "sqlite":
+            import aiosqlite
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+            Path(self.checkpoint_path).parent.mkdir(parents=True, exist_ok=True)
+
+            # Construct the connection directly rather than entering
+            # from_conn_string(), whose context manager would close it again
+            logger.info("Using SQLite checkpointer at %s", self.checkpoint_path)
+            return AsyncSqliteSaver(
+                aiosqlite.connect(self.checkpoint_path), serde=OrjsonSerializer()
+            )
+
+        if self.checkpointer_backend == "postgres":
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+            from psycopg.rows import dict_row
+            from psycopg_pool import AsyncConnectionPool
+
+            # The pool is opened in setup() since it needs to be awaited
+            pool = AsyncConnectionPool(
+                conninfo=self.checkpoint_path,
+                open=False,
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+            )
+            logger.info("Using Postgres checkpointer")
+            return AsyncPostgresSaver(pool, serde=OrjsonSerializer())
+
+        raise ValueError(f"Unsupported checkpointer backend: {self.checkpointer_backend}")
 
-        # Build the graph
-        self.graph: Any = self._build_graph()  # CompiledGraph type
+    async def setup(self) -> None:
+        """
+        Prepare the checkpointer for use.
+
+        Opens the Postgres connection pool and creates the checkpoint tables
+        if needed. Should be called once during application startup.
+        """
+        if self.checkpointer_backend == "postgres" and self.checkpoint_path != ":memory:":
+            await self.checkpointer.conn.open()
+
+        if hasattr(self.checkpointer, "setup"):
+            await self.checkpointer.setup()
 
-        logger.info(f"Initialized SplunkMCPAgent with {len(tools)} tools and model {model_name}")
+    async def aclose(self) -> None:
+        """Close the checkpointer's database connection, if any."""
+        conn = getattr(self.checkpointer, "conn", None)
+        if conn is not None:
+            await conn.close()
 
     def _build_graph(self) -> Any:  # Returns CompiledGraph
         """Build the LangGraph state graph."""
@@ -77,11 +417,18 @@ class SplunkMCPAgent:
 
         # Add nodes
         workflow.add_node("call_model", self._call_model_node)
-        workflow.add_node("execute_tools", ToolNode(self.tools))
-        workflow.add_node("human_review", self._human_review_node)
+        workflow.add_node("execute_tools", ParallelToolNode(self._tools_by_name))
+        workflow.add_node("human_review", self._emit_approval_request_node)
+        workflow.add_node("apply_approval_decision", self._apply_approval_decision_node)
 
-        # Set entry point
-        workflow.set_entry_point("call_model")
+        # Start at the model, or apply a decision when resuming after review
+        workflow.set_conditional_entry_point(
+            self._route_entry,
+            {
+                "call_model": "call_model",
+                "apply_approval_decision": "apply_approval_decision",
+            },
+        )
 
         # Add conditional edges
         workflow.add_conditional_edges(
@@ -97,115 +444,367 @@ class SplunkMCPAgent:
         # After tool execution, go back to model
         workflow.add_edge("execute_tools", "call_model")
 
-        # After human review, execute tools
-        workflow.add_edge("human_review", "execute_tools")
+        # Stop after requesting review; resume() continues the thread
+        workflow.add_edge("human_review", END)
+
+        # After an approval decision, execute tools unless rejected
+        workflow.add_conditional_edges(
+            "apply_approval_decision",
+            self._after_approval,
+            {
+                "execute_tools": "execute_tools",
+                "end": END,
+            },
+        )
 
-        # Compile with checkpointer
         return workflow.compile(checkpointer=self.checkpointer)
 
-    def _call_model_node(self, state: AgentState) -> dict:
+    async def _call_model_node(self, state: AgentState, config: RunnableConfig) -> dict:
         """
         Call the LLM with current state.
 
+        Single requests are streamed, so token events reach ``astream``
+        consumers using ``stream_mode="messages"`` before the reply completes.
+
         Args:
             state: Current agent state
+            config: Runnable config carrying the run's callbacks
 
         Returns:
             Updated state with new message
         """
-        messages = state["messages"]
+        messages, summary_update = await self._prepare_context(state, config)
+
+        logger.debug("Calling LLM with %d message(s)", len(messages))
 
-        logger.debug(f"Calling LLM with {len(messages)} message(s)")
+        # Concurrent calls from other threads are coalesced into one batch
+        response = await self._batcher.submit(messages, config)
 
-        response = self.llm_with_tools.invoke(messages)
+        # Classify tool calls once so routing and review don't re-scan them
+        response.additional_kwargs["_has_tool_calls"] = bool(response.tool_calls)
+        response.additional_kwargs["_sensitive_calls"] = [
+            tool_call
+            for tool_call in response.tool_calls
+            if tool_call["name"] in self._sensitive_tool_names
+        ]
 
         return {
             "messages": [response],
             "pending_approval": False,
             "approval_request": None,
+            **summary_update,
         }
 
-    def _human_review_node(self, state: AgentState) -> dict:
+    async def _prepare_context(
+        self, state: AgentState, config: RunnableConfig
+    ) -> tuple[list[BaseMessage], dict]:
         """
-        Node for human-in-the-loop review.
+        Select the messages to send to the LLM.
 
-        This node interrupts execution and waits for human approval
-        of sensitive tool calls.
+        Long threads keep leading system messages and the most recent
+        messages; everything in between is replaced by a running summary.
+        Only messages not yet covered by the stored summary are summarized.
 
         Args:
             state: Current agent state
+            config: Runnable config carrying the run's callbacks
 
         Returns:
-            Updated state after approval
+            Messages for the LLM and any state update for the summary
         """
         messages = state["messages"]
-        last_message = messages[-1]
+        if len(messages) <= self.max_context_messages:
+            return messages, {}
+
+        head = 0
+        while head < len(messages) and isinstance(messages[head], SystemMessage):
+            head += 1
+
+        # Leave one slot for the summary and never separate tool results
+        # from the AIMessage that requested them
+        start = max(head, len(messages) - (self.max_context_messages - 1))
+        while start > head and isinstance(messages[start], ToolMessage):
+            start -= 1
+
+        older_count = start - head
+        if older_count <= self.summarize_threshold:
+            return messages, {}
+
+        summary = state.get("conversation_summary")
+        summarized_count = state.get("summarized_count", 0)
+        update: dict = {}
+        if summary is None or summarized_count < older_count:
+            summary = await self._summarize(
+                summary, messages[head + summarized_count : start], config
+            )
+            update = {"conversation_summary": summary, "summarized_count": older_count}
+
+        context = [
+            *messages[:head],
+            SystemMessage(content=f"Earlier conversation summary: {summary}"),
+            *messages[start:],
+        ]
+        return context, update
+
+    async def _summarize(
+        self, summary: str | None, messages: list[BaseMessage], config: RunnableConfig
+    ) -> str:
+        """
+        Fold messages into the running conversation summary.
+
+        Args:
+            summary: Existing summary, if any
+            messages: Messages not yet covered by the summary
+            config: Runnable config carrying the run's callbacks
+
+        Returns:
+            Updated summary
+        """
+        logger.debug("Summarizing %d older message(s)", len(messages))
+
+        prompt = (
+            "Summarize the conversation below for an assistant that will continue it. "
+            "Keep facts, decisions, Splunk queries and their key results; be concise."
+        )
+        if summary:
+            prompt += f"\n\nExisting summary to extend:\n{summary}"
+
+        response = await self._summarizer.ainvoke(
+            [SystemMessage(content=prompt), HumanMessage(content=get_buffer_string(messages))],
+            config,
+        )
+        return str(response.content)
+
+    def _start_speculative_calls(
+        self, thread_id: str, tool_calls: list[ToolCall]
+    ) -> dict[str, asyncio.Task]:
+        """
+        Start read-only sensitive tool calls while waiting for approval.
+
+        Args:
+            thread_id: Conversation thread ID
+            tool_calls: Tool calls awaiting approval
+
+        Returns:
+            Running tasks keyed by tool call ID
+        """
+        tasks = {}
+        for tool_call in tool_calls:
+            tool = self._tools_by_name.get(tool_call["name"])
+            if tool_call["name"] in SPECULATIVE_TOOLS and tool is not None:
+                tasks[tool_call["id"]] = asyncio.create_task(
+                    tool.ainvoke({**tool_call, "type": "tool_call"})
+                )
+
+        if tasks:
+            logger.debug("Started %d speculative tool call(s) for thread %s", len(tasks), thread_id)
+            _speculative_calls[thread_id] = tasks
+            if len(_speculative_calls) > _SPECULATIVE_CACHE_SIZE:
+                _, stale = _speculative_calls.popitem(last=False)
+                for task in stale.values():
+                    task.cancel()
+
+        return tasks
+
+    def _get_sensitive_calls(self, message: AIMessage) -> list[ToolCall]:
+        """
+        Get the tool calls of a message that require human approval.
+
+        Args:
+            message: AIMessage with tool calls
+
+        Returns:
+            Sensitive tool calls, in call order
+        """
+        sensitive_calls = message.additional_kwargs.get("_sensitive_calls")
+        if sensitive_calls is None:
+            sensitive_calls = [
+                tool_call
+                for tool_call in message.tool_calls
+                if tool_call["name"] in self._sensitive_tool_names
+            ]
+        return sensitive_calls
+
+    async def _emit_approval_request_node(self, state: AgentState, config: RunnableConfig) -> dict:
+        """
+        Node that records sensitive tool calls awaiting human approval.
+
+        The run ends after this node; it is continued by ``resume`` once a
+        decision arrives, so no request is held open while the human reviews.
+        Read-only calls in SPECULATIVE_TOOLS are started in the meantime.
+
+        Args:
+            state: Current agent state
+            config: Runnable config carrying the thread ID
+
+        Returns:
+            State update with the pending approval request
+        """
+        last_message = state["messages"][-1]
 
         if not isinstance(last_message, AIMessage) or not last_message.tool_calls:
             logger.warning("Human review called but no tool calls found")
-            return state
+            return {}
 
-        # Get the tool calls that need approval
-        tool_calls = last_message.tool_calls
+        sensitive_calls = self._get_sensitive_calls(last_message)
 
         # Create approval request
         approval_requests = []
-        for tool_call in tool_calls:
+        for tool_call in sensitive_calls:
             tool_name = tool_call["name"]
-            if tool_name in SENSITIVE_TOOLS:
-                approval_requests.append(
-                    {
-                        "action": tool_call["name"],
-                        "tool_name": tool_name,
-                        "arguments": tool_call["args"],
-                        "description": (
-                            f"Approve execution of {tool_name} with arguments: {tool_call['args']}"
-                        ),
-                    }
-                )
-
-        if approval_requests:
-            logger.info(f"Requesting human approval for {len(approval_requests)} action(s)")
-
-            # Interrupt and wait for approval
-            approval = interrupt(
+            approval_requests.append(
                 {
-                    "action_requests": approval_requests,
-                    "message": "Human approval required for sensitive operations",
+                    "action": tool_call["name"],
+                    "tool_name": tool_name,
+                    "arguments": tool_call["args"],
+                    "description": (
+                        f"Approve execution of {tool_name} with arguments: {tool_call['args']}"
+                    ),
                 }
             )
 
-            logger.info(f"Received approval decision: {approval}")
-
-            # Process approval decision
-            # The approval should contain decisions for each request
-            decisions = approval.get("decisions", [])
-
-            for i, decision in enumerate(decisions):
-                if decision.get("type") == "reject":
-                    # Remove the tool call from the message
-                    logger.info(f"Tool call {i} rejected by human")
-                    # Add a message indicating rejection
-                    return {
-                        "messages": [
-                            AIMessage(
-                                content="The requested operation was rejected by human review."
-                            )
-                        ],
-                        "pending_approval": False,
-                        "approval_request": None,
-                    }
-                elif decision.get("type") == "edit":
-                    # Update tool call arguments
-                    edited_args = decision.get("edited_arguments", {})
-                    tool_calls[i]["args"] = edited_args
-                    logger.info(f"Tool call {i} edited by human")
+        logger.info("Requesting human approval for %d action(s)", len(approval_requests))
+
+        self._start_speculative_calls(config["configurable"]["thread_id"], sensitive_calls)
 
         return {
+            "pending_approval": True,
+            "approval_request": {
+                "action_requests": approval_requests,
+                "message": "Human approval required for sensitive operations",
+            },
+            "approval_decision": None,
+        }
+
+    async def _apply_approval_decision_node(
+        self, state: AgentState, config: RunnableConfig
+    ) -> dict:
+        """
+        Node that applies the human's decision to the pending tool calls.
+
+        Args:
+            state: Current agent state, with ``approval_decision`` set by ``resume``
+            config: Runnable config carrying the thread ID
+
+        Returns:
+            Updated state after approval
+        """
+        approval = state.get("approval_decision") or {}
+        logger.info("Received approval decision: %s", approval)
+
+        speculative = _speculative_calls.pop(config["configurable"]["thread_id"], {})
+        cleared = {
             "pending_approval": False,
             "approval_request": None,
+            "approval_decision": None,
         }
 
+        last_message = state["messages"][-1]
+        if not isinstance(last_message, AIMessage) or not last_message.tool_calls:
+            logger.warning("Approval decision received but no tool calls found")
+            return cleared
+
+        tool_calls = last_message.tool_calls
+        sensitive_calls = self._get_sensitive_calls(last_message)
+
+        # Process approval decision
+        # The approval should contain decisions for each request
+        decisions = approval.get("decisions", [])
+        edited_args_by_id: dict[str, dict] = {}
+
+        for i, decision in enumerate(decisions):
+            if decision.get("type") == "reject":
+                for task in speculative.values():
+                    task.cancel()
+                logger.info("Tool call %d rejected by human", i)
+                # Answer every tool call so the history stays valid for the
+                # model, then add a message indicating rejection
+                rejections: list[BaseMessage] = [
+                    ToolMessage(
+                        content="Tool call rejected by human review.",
+                        name=tool_call["name"],
+                        tool_call_id=tool_call["id"],
+                        status="error",
+                    )
+                    for tool_call in tool_calls
+                ]
+                rejections.append(
+                    AIMessage(content="The requested operation was rejected by human review.")
+                )
+                return {"messages": rejections, **cleared}
+            elif decision.get("type") == "edit" and i < len(sensitive_calls):
+                # Record the new arguments for the matching tool call
+                call_id = sensitive_calls[i]["id"]
+                edited_args_by_id[call_id] = decision.get("edited_arguments", {})
+                task = speculative.pop(call_id, None)
+                if task is not None:
+                    task.cancel()
+                logger.info("Tool call %d edited by human", i)
+
+        updates: list[BaseMessage] = []
+
+        if edited_args_by_id:
+            # Emit a copy of the AIMessage with the same ID so add_messages
+            # replaces the original instead of relying on in-place mutation
+            def edit(calls: list[ToolCall]) -> list[ToolCall]:
+                return [
+                    {**call, "args": edited_args_by_id[call["id"]]}
+                    if call["id"] in edited_args_by_id
+                    else call
+                    for call in calls
+                ]
+
+            additional_kwargs = dict(last_message.additional_kwargs)
+            if "_sensitive_calls" in additional_kwargs:
+                additional_kwargs["_sensitive_calls"] = edit(sensitive_calls)
+            updates.append(
+                last_message.model_copy(
+                    update={"tool_calls": edit(tool_calls), "additional_kwargs": additional_kwargs}
+                )
+            )
+
+        # Use the results of approved speculative calls; anything that
+        # failed is left for execute_tools to run again
+        for call_id, task in speculative.items():
+            try:
+                updates.append(await task)
+            except Exception as e:
+                logger.warning("Speculative tool call %s failed: %s", call_id, e)
+
+        if updates:
+            return {"messages": updates, **cleared}
+
+        return cleared
+
+    def _route_entry(self, state: AgentState) -> Literal["call_model", "apply_approval_decision"]:
+        """
+        Choose where a run starts.
+
+        Args:
+            state: Current agent state
+
+        Returns:
+            "apply_approval_decision" when resuming with a decision, else "call_model"
+        """
+        if state.get("pending_approval") and state.get("approval_decision") is not None:
+            return "apply_approval_decision"
+        return "call_model"
+
+    def _after_approval(self, state: AgentState) -> Literal["execute_tools", "end"]:
+        """
+        Determine next step after an approval decision was applied.
+
+        Args:
+            state: Current agent state
+
+        Returns:
+            "end" if the tool calls were rejected, else "execute_tools"
+        """
+        last_message = state["messages"][-1]
+        if isinstance(last_message, AIMessage) and not last_message.tool_calls:
+            return "end"
+        return "execute_tools"
+
     def _should_continue(
         self, state: AgentState
     ) -> Literal["execute_tools", "human_review", "end"]:
@@ -221,19 +820,60 @@ class SplunkMCPAgent:
         messages = state["messages"]
         last_message = messages[-1]
 
+        if not isinstance(last_message, AIMessage):
+            return "end"
+
+        # Use the classification stored by _call_model_node when available
+        kwargs = last_message.additional_kwargs
+        if "_has_tool_calls" in kwargs:
+            if not kwargs["_has_tool_calls"]:
+                return "end"
+            return "human_review" if kwargs["_sensitive_calls"] else "execute_tools"
+
         # If no tool calls, we're done
-        if not isinstance(last_message, AIMessage) or not last_message.tool_calls:
+        if not last_message.tool_calls:
             return "end"
 
         # Check if any tool calls require human approval
         tool_calls = last_message.tool_calls
-        needs_approval = any(tool_call["name"] in SENSITIVE_TOOLS for tool_call in tool_calls)
+        needs_approval = not self._sensitive_tool_names.isdisjoint(
+            tool_call["name"] for tool_call in tool_calls
+        )
 
         if needs_approval:
             return "human_review"
         else:
             return "execute_tools"
 
+    async def _make_input(self, message: str, config: dict) -> dict:
+        """
+        Build the graph input for a user message.
+
+        Only the first turn of a thread initializes the full state. Later
+        turns send just the new message, so persisted fields (such as a
+        pending approval) are not overwritten.
+
+        Args:
+            message: User message
+            config: Graph config with the thread ID
+
+        Returns:
+            Input state for the graph
+        """
+        input_state: dict[str, Any] = {"messages": [HumanMessage(content=message)]}
+
+        snapshot = await self.graph.aget_state(config)
+        if not snapshot.values:
+            input_state.update(
+                {
+                    "pending_approval": False,
+                    "approval_request": None,
+                    "approval_decision": None,
+                }
+            )
+
+        return input_state
+
     async def ainvoke(self, message: str, thread_id: str) -> dict:
         """
         Invoke the agent asynchronously.
@@ -246,72 +886,93 @@ class SplunkMCPAgent:
             Agent response with state
         """
         config = {"configurable": {"thread_id": thread_id}}
-
-        # Create input state
-        input_state = {
-            "messages": [HumanMessage(content=message)],
-            "retrieved_documents": [],
-            "pending_approval": False,
-            "approval_request": None,
-        }
+        input_state = await self._make_input(message, config)
 
         # Invoke the graph
         result = await self.graph.ainvoke(input_state, config)
 
         return result
 
-    def invoke(self, message: str, thread_id: str) -> dict:
+    async def resume(self, thread_id: str, decisions: list[dict[str, Any]]) -> dict:
         """
-        Invoke the agent synchronously.
+        Continue a thread that is waiting for human approval.
 
         Args:
-            message: User message
             thread_id: Conversation thread ID
+            decisions: One decision per approval request, each with a "type"
+                of "approve", "reject", or "edit" (plus "edited_arguments")
 
         Returns:
             Agent response with state
+
+        Raises:
+            NoPendingApprovalError: If the thread has no pending approval
         """
         config = {"configurable": {"thread_id": thread_id}}
 
-        # Create input state
-        input_state = {
-            "messages": [HumanMessage(content=message)],
-            "retrieved_documents": [],
-            "pending_approval": False,
-            "approval_request": None,
-        }
+        # Without a pending approval the decision would route to call_model,
+        # re-running the LLM and leaving the decision in checkpointed state
+        snapshot = await self.graph.aget_state(config)
+        if not snapshot.values.get("pending_approval"):
+            raise NoPendingApprovalError(f"Thread {thread_id} has no pending approval")
 
-        # Invoke the graph
-        result = self.graph.invoke(input_state, config)
+        input_state = {"messages": [], "approval_decision": {"decisions": decisions}}
+
+        result = await self.graph.ainvoke(input_state, config)
 
         return result
 
-    async def astream(self, message: str, thread_id: str):
+    def invoke(self, message: str, thread_id: str) -> dict:
+        """
+        Invoke the agent synchronously.
+
+        Runs ``ainvoke`` on the loop the agent was created on if that loop is
+        running in another thread, else on a persistent background loop. The
+        checkpointer, HTTP client and semaphores are bound to the loop they
+        first run on, so every call must use the same one.
+
+        Args:
+            message: User message
+            thread_id: Conversation thread ID
+
+        Returns:
+            Agent response with state
+
+        Raises:
+            RuntimeError: If called from inside a running event loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("invoke() cannot be called from a running event loop; use ainvoke()")
+
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            loop = self._loop = _get_sync_loop()
+        return asyncio.run_coroutine_threadsafe(self.ainvoke(message, thread_id), loop).result()
+
+    async def astream(self, message: str, thread_id: str, stream_mode: str | list[str] = "updates"):
         """
         Stream agent execution.
 
         Args:
             message: User message
             thread_id: Conversation thread ID
+            stream_mode: LangGraph stream mode(s); use "messages" for LLM tokens
 
         Yields:
-            State updates as they occur
+            State updates (or tokens) as they occur
         """
         config = {"configurable": {"thread_id": thread_id}}
-
-        # Create input state
-        input_state = {
-            "messages": [HumanMessage(content=message)],
-            "retrieved_documents": [],
-            "pending_approval": False,
-            "approval_request": None,
-        }
+        input_state = await self._make_input(message, config)
 
         # Stream the graph execution
-        async for event in self.graph.astream(input_state, config):
+        async for event in self.graph.astream(input_state, config, stream_mode=stream_mode):
             yield event
 
-    def get_state(self, thread_id: str) -> dict:
+    def get_state(self, thread_id: str) -> StateSnapshot:
         """
         Get current state for a thread.
 
@@ -325,11 +986,27 @@ class SplunkMCPAgent:
         state = self.graph.get_state(config)
         return state
 
+    async def aget_state(self, thread_id: str) -> StateSnapshot:
+        """
+        Get current state for a thread asynchronously.
+
+        Args:
+            thread_id: Conversation thread ID
+
+        Returns:
+            Current state
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        state = await self.graph.aget_state(config)
+        return state
+
 
 def create_agent(
     tools: list[BaseTool],
     model_name: str = "gpt-4o",
     checkpoint_path: str = "./data/checkpoints/agent.db",
+    checkpointer_backend: str = "sqlite",
+    max_context_messages: int = 20,
 ) -> SplunkMCPAgent:
     """
     Factory function to create an agent.
@@ -337,9 +1014,17 @@ def create_agent(
     Args:
         tools: List of tools for the agent
         model_name: OpenAI model name
-        checkpoint_path: Path to checkpoint database
+        checkpoint_path: Path to checkpoint database or Postgres connection string
+        checkpointer_backend: Checkpoint backend ("sqlite" or "postgres")
+        max_context_messages: Maximum number of messages sent to the LLM
 
     Returns:
         Initialized agent
     """
-    return SplunkMCPAgent(tools=tools, model_name=model_name, checkpoint_path=checkpoint_path)
+    return SplunkMCPAgent(
+        tools=tools,
+        model_name=model_name,
+        checkpoint_path=checkpoint_path,
+        checkpointer_backend=checkpointer_backend,
+        max_context_messages=max_context_messages,
+    )
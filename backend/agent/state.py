@@ -12,20 +12,24 @@ class AgentState(TypedDict):
 
     Attributes:
         messages: Conversation history (automatically merged)
-        retrieved_documents: Documents retrieved from RAG
         pending_approval: Whether there's a pending human approval
         approval_request: Details of the action requiring approval
+        approval_decision: Human decision supplied when resuming a thread
+        conversation_summary: Summary of messages outside the LLM context window
+        summarized_count: Number of non-system messages covered by the summary
     """
 
     # Messages are automatically merged using add_messages
     messages: Annotated[list[BaseMessage], add_messages]
 
-    # Retrieved documents from RAG
-    retrieved_documents: list[str]
-
     # Human-in-the-loop state
     pending_approval: bool
     approval_request: dict | None
+    approval_decision: dict | None
+
+    # Context window management
+    conversation_summary: str | None
+    summarized_count: int
 
 
 class ChatRequest(TypedDict):
@@ -0,0 +1,203 @@
+"""Concurrent tool execution node for the LangGraph agent."""
+
+import asyncio
+import logging
+from collections.abc import Iterator
+from typing import Any
+
+from langchain_core.messages import AIMessage, ToolCall, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+
+from backend.agent.state import AgentState
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_strings(value: Any) -> Iterator[str]:
+    """Yield every string nested inside tool call arguments."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, list | tuple):
+        for item in value:
+            yield from _iter_strings(item)
+
+
+def _substitute(value: Any, outputs: dict[str, str]) -> Any:
+    """Replace ``${<tool_call_id>.output}`` placeholders with earlier tool outputs."""
+    if isinstance(value, str):
+        for call_id, output in outputs.items():
+            value = value.replace(f"${{{call_id}.output}}", output)
+        return value
+    if isinstance(value, dict):
+        return {key: _substitute(item, outputs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, outputs) for item in value]
+    return value
+
+
+class ParallelToolNode:
+    """
+    Execute the tool calls of the last AIMessage concurrently.
+
+    Tool calls are grouped into dependency layers (LLMCompiler style): a call
+    depends on another if any string in its arguments references the other
+    call's ``tool_call_id`` or its ``${<tool_call_id>.output}`` placeholder.
+    Calls within a layer run under ``asyncio.gather``, capped by a semaphore
+    so MCP servers are not flooded. The semaphore is created lazily for the
+    running event loop, since the node may be shared by agents on other loops.
+    """
+
+    def __init__(
+        self, tools: list[BaseTool] | dict[str, BaseTool], max_concurrency: int = 8
+    ) -> None:
+        """
+        Initialize the tool node.
+
+        Args:
+            tools: Tools that can be called by the model, or a prebuilt
+                name-to-tool mapping
+            max_concurrency: Maximum number of tool calls running at once
+        """
+        self.tools_by_name = tools if isinstance(tools, dict) else {t.name: t for t in tools}
+        self.max_concurrency = max_concurrency
+        self._semaphores: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            # Drop semaphores of loops that have since been closed
+            for stale in [other for other in self._semaphores if other.is_closed()]:
+                del self._semaphores[stale]
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def __call__(self, state: AgentState, config: RunnableConfig) -> dict:
+        """
+        Run the pending tool calls.
+
+        Args:
+            state: Current agent state
+            config: Runnable config of the graph run, passed on to the tools so
+                callbacks, tags and configurable values propagate
+
+        Returns:
+            State update with one ToolMessage per tool call, in call order
+        """
+        # Find the AIMessage that issued the calls; ToolMessages after it
+        # (e.g. speculative results injected by human review) are already done
+        messages = state["messages"]
+        answered: set[str] = set()
+        ai_message = None
+        for message in reversed(messages):
+            if isinstance(message, ToolMessage):
+                answered.add(message.tool_call_id)
+                continue
+            ai_message = message
+            break
+
+        if not isinstance(ai_message, AIMessage) or not ai_message.tool_calls:
+            logger.warning("Tool execution called but no tool calls found")
+            return {"messages": []}
+
+        tool_calls = [call for call in ai_message.tool_calls if call["id"] not in answered]
+        results: dict[str, ToolMessage] = {}
+        outputs: dict[str, str] = {}
+
+        semaphore = self._semaphore()
+        for layer in self._layer(tool_calls):
+            layer_results = await asyncio.gather(
+                *(self._run(call, outputs, semaphore, config) for call in layer)
+            )
+            for call, message in zip(layer, layer_results, strict=True):
+                results[call["id"]] = message
+                outputs[call["id"]] = str(message.content)
+
+        return {"messages": [results[call["id"]] for call in tool_calls]}
+
+    def _layer(self, tool_calls: list[ToolCall]) -> list[list[ToolCall]]:
+        """
+        Group tool calls into layers that can run concurrently.
+
+        Args:
+            tool_calls: Tool calls from the AIMessage
+
+        Returns:
+            Layers in execution order; each layer only depends on earlier ones
+        """
+        ids = {call["id"] for call in tool_calls}
+        depends_on: dict[str, set[str]] = {}
+        for call in tool_calls:
+            strings = list(_iter_strings(call["args"]))
+            depends_on[call["id"]] = {
+                other for other in ids if other != call["id"] and any(other in s for s in strings)
+            }
+
+        layers: list[list[ToolCall]] = []
+        done: set[str] = set()
+        remaining = list(tool_calls)
+        while remaining:
+            layer = [call for call in remaining if depends_on[call["id"]] <= done]
+            if not layer:
+                # Circular references; run whatever is left one at a time
+                logger.warning("Circular tool call dependencies detected, running sequentially")
+                layers.extend([call] for call in remaining)
+                break
+            layers.append(layer)
+            done.update(call["id"] for call in layer)
+            remaining = [call for call in remaining if call["id"] not in done]
+
+        return layers
+
+    async def _run(
+        self,
+        call: ToolCall,
+        outputs: dict[str, str],
+        semaphore: asyncio.Semaphore,
+        config: RunnableConfig,
+    ) -> ToolMessage:
+        """
+        Execute a single tool call.
+
+        Args:
+            call: Tool call to execute
+            outputs: Outputs of already completed tool calls
+            semaphore: Concurrency limit for the running event loop
+            config: Runnable config of the graph run
+
+        Returns:
+            ToolMessage with the tool result or error
+        """
+        tool = self.tools_by_name.get(call["name"])
+        if tool is None:
+            return ToolMessage(
+                content=(
+                    f"Error: {call['name']} is not a valid tool, "
+                    f"try one of [{', '.join(self.tools_by_name)}]."
+                ),
+                name=call["name"],
+                tool_call_id=call["id"],
+                status="error",
+            )
+
+        args = _substitute(call["args"], outputs) if outputs else call["args"]
+
+        async with semaphore:
+            try:
+                return await tool.ainvoke(
+                    {"name": call["name"], "args": args, "id": call["id"], "type": "tool_call"},
+                    config,
+                )
+            except Exception as e:
+                logger.error("Error executing tool %s: %s", call["name"], e, exc_info=True)
+                return ToolMessage(
+                    content=f"Error: {e!r}\n Please fix your mistakes.",
+                    name=call["name"],
+                    tool_call_id=call["id"],
+                    status="error",
+                )
@@ -1,14 +1,85 @@
 """Agent tools for RAG retrieval and MCP integration."""
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from typing import Annotated
+from weakref import WeakValueDictionary
 
 from langchain_core.tools import tool
 
+from backend.mcp.server_manager import MCPServerManager
 from backend.rag.vectorstore import VectorStoreManager
 
 logger = logging.getLogger(__name__)
 
+# Formatted retrieval results keyed by
+# (tool name, vector store id, vector store version, normalized query, k).
+# The version changes whenever documents are added or deleted, so stale
+# entries are never served after the knowledge base changes.
+_CACHE_MAX_SIZE = 256
+_CACHE_TTL_SECONDS = 300.0
+_retrieval_cache: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+_retrieval_locks: WeakValueDictionary[tuple, asyncio.Lock] = WeakValueDictionary()
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+def _get_cached(key: tuple) -> str | None:
+    """Return a cached retrieval result if present and not expired."""
+    entry = _retrieval_cache.get(key)
+    if entry is None:
+        return None
+
+    cached_at, result = entry
+    if time.monotonic() - cached_at > _CACHE_TTL_SECONDS:
+        del _retrieval_cache[key]
+        return None
+
+    _retrieval_cache.move_to_end(key)
+    return result
+
+
+async def _cached_retrieval(key: tuple, fetch: Callable[[], Awaitable[str]]) -> str:
+    """
+    Return a cached retrieval result, running ``fetch`` on a miss.
+
+    Concurrent misses for the same key wait on a per-key lock so the search
+    runs only once. Exceptions from ``fetch`` propagate and are not cached.
+
+    Args:
+        key: Cache key
+        fetch: Coroutine function producing the formatted result
+
+    Returns:
+        Formatted retrieval result
+    """
+    result = _get_cached(key)
+    if result is not None:
+        logger.debug("RAG cache hit")
+        return result
+
+    lock = _retrieval_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _retrieval_locks[key] = lock
+
+    async with lock:
+        result = _get_cached(key)
+        if result is not None:
+            return result
+
+        result = await fetch()
+        _retrieval_cache[key] = (time.monotonic(), result)
+        if len(_retrieval_cache) > _CACHE_MAX_SIZE:
+            _retrieval_cache.popitem(last=False)
+        return result
+
 
 def create_rag_tool(vectorstore: VectorStoreManager):
     """
@@ -22,7 +93,7 @@ def create_rag_tool(vectorstore: VectorStoreManager):
     """
 
     @tool
-    def retrieve_documents(
+    async def retrieve_documents(
         query: Annotated[str, "The search query to find relevant documents"],
     ) -> str:
         """
@@ -31,30 +102,34 @@ def create_rag_tool(vectorstore: VectorStoreManager):
         Use this tool when you need to find information from uploaded documents
         or the knowledge base to answer user questions.
         """
-        logger.info(f"RAG retrieval for query: {query}")
+        logger.info("RAG retrieval for query: %s", query)
 
-        try:
+        async def fetch() -> str:
             # Retrieve documents
-            results = vectorstore.similarity_search(query, k=4)
+            results = await vectorstore.asimilarity_search(query, k=4)
 
             if not results:
                 return "No relevant documents found in the knowledge base."
 
             # Format results
-            formatted_results = []
-            for i, doc in enumerate(results, 1):
-                source = doc.metadata.get("source", "Unknown")
-                page = doc.metadata.get("page", "N/A")
-                content = doc.page_content.strip()
-
-                formatted_results.append(
-                    f"[Document {i}] Source: {source}, Page: {page}\n{content}"
-                )
+            return "\n\n".join(
+                f"[Document {i}] Source: {doc.metadata.get('source', 'Unknown')}, "
+                f"Page: {doc.metadata.get('page', 'N/A')}\n{doc.page_content.strip()}"
+                for i, doc in enumerate(results, 1)
+            )
 
-            return "\n\n".join(formatted_results)
+        try:
+            key = (
+                "retrieve_documents",
+                id(vectorstore),
+                vectorstore.version,
+                _normalize_query(query),
+                4,
+            )
+            return await _cached_retrieval(key, fetch)
 
         except Exception as e:
-            logger.error(f"Error during RAG retrieval: {e}")
+            logger.error("Error during RAG retrieval: %s", e)
             return f"Error retrieving documents: {str(e)}"
 
     return retrieve_documents
@@ -72,7 +147,7 @@ def create_document_search_tool(vectorstore: VectorStoreManager):
     """
 
     @tool
-    def search_documents(
+    async def search_documents(
         query: Annotated[str, "The search query"],
         num_results: Annotated[int, "Number of results to return"] = 4,
     ) -> str:
@@ -82,34 +157,73 @@ def create_document_search_tool(vectorstore: VectorStoreManager):
         Use this to find specific information across all uploaded documents.
         Returns formatted excerpts from the most relevant documents.
         """
-        logger.info(f"Document search: {query} (k={num_results})")
+        logger.info("Document search: %s (k=%d)", query, num_results)
 
-        try:
-            results = vectorstore.similarity_search_with_score(query, k=num_results)
+        async def fetch() -> str:
+            results = await vectorstore.asimilarity_search_with_score(query, k=num_results)
 
             if not results:
                 return "No documents found matching your query."
 
-            formatted_results = []
-            for i, (doc, score) in enumerate(results, 1):
-                source = doc.metadata.get("source", "Unknown")
-                relevance = f"{(1 - score) * 100:.1f}%"  # Convert distance to relevance
-
-                formatted_results.append(
-                    f"[{i}] {source} (Relevance: {relevance})\n{doc.page_content.strip()}"
-                )
+            # Relevance is derived from the distance score as (1 - score)
+            return "\n\n".join(
+                f"[{i}] {doc.metadata.get('source', 'Unknown')} "
+                f"(Relevance: {(1 - score) * 100:.1f}%)\n{doc.page_content.strip()}"
+                for i, (doc, score) in enumerate(results, 1)
+            )
 
-            return "\n\n".join(formatted_results)
+        try:
+            key = (
+                "search_documents",
+                id(vectorstore),
+                vectorstore.version,
+                _normalize_query(query),
+                num_results,
+            )
+            return await _cached_retrieval(key, fetch)
 
         except Exception as e:
-            logger.error(f"Error during document search: {e}")
+            logger.error("Error during document search: %s", e)
             return f"Error searching documents: {str(e)}"
 
     return search_documents
 
 
+def create_mcp_describe_tool(mcp_manager: MCPServerManager):
+    """
+    Create a tool returning the full description of an MCP tool.
+
+    MCP tool descriptions are shortened before they are sent to the model,
+    so the model can use this tool to read the complete usage notes.
+
+    Args:
+        mcp_manager: Initialized MCP server manager
+
+    Returns:
+        LangChain tool describing MCP tools
+    """
+
+    @tool
+    def describe_mcp_tool(
+        tool_name: Annotated[str, "Full name of the MCP tool, e.g. splunk-mcp_run_query"],
+    ) -> str:
+        """
+        Get the complete description and input schema of an MCP tool.
+
+        MCP tool descriptions you see are shortened summaries. Call this before
+        using an MCP tool whose arguments or behavior are unclear.
+        """
+        description = mcp_manager.describe_tool(tool_name)
+        if description is None:
+            return f"Unknown MCP tool: {tool_name}"
+        return description
+
+    return describe_mcp_tool
+
+
 # Note: MCP tools are created dynamically by the MCPServerManager
-# and registered with the agent. This file contains RAG-specific tools.
+# and registered with the agent. This file contains RAG-specific tools
+# and helpers for working with MCP tools.
 #
 # The MCP tools (Splunk, Atlassian, etc.) are loaded from backend/mcp/server_manager.py
 # and automatically integrated into the agent's toolset.
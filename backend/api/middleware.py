@@ -0,0 +1,58 @@
+"""ASGI middleware for the agent API."""
+
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject upload requests whose declared body size is over the limit.
+
+    Starlette spools a multipart body to disk before the route runs, so the
+    per-file check in the upload routes only fires once the whole body has
+    been received. This middleware answers 413 from the ``Content-Length``
+    header before any of the body is read; requests without the header are
+    left to the per-file check.
+    """
+
+    def __init__(self, app: ASGIApp, limits: dict[str, int]) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            limits: Largest accepted body, in bytes, keyed by request path
+        """
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Check the declared body size of POSTs to limited paths."""
+        if scope["type"] == "http" and scope["method"] == "POST":
+            limit = self.limits.get(scope["path"])
+            if limit is not None:
+                length = _content_length(scope)
+                if length is not None and length > limit:
+                    response = ORJSONResponse(
+                        status_code=413,
+                        content={
+                            "detail": (
+                                f"Request too large: {length} bytes (limit is {limit} bytes)"
+                            )
+                        },
+                    )
+                    await response(scope, receive, send)
+                    return
+
+        await self.app(scope, receive, send)
+
+
+def _content_length(scope: Scope) -> int | None:
+    """Get the request's Content-Length, or None if missing or malformed."""
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
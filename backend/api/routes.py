@@ -1,50 +1,91 @@
 """FastAPI routes for the agent API."""
 
+import asyncio
+import io
 import logging
-import uuid
-from typing import Any
-
-from fastapi import APIRouter, File, HTTPException, UploadFile
+import os
+import secrets
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Annotated, Any
+from urllib.parse import unquote
+
+import orjson
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from langchain_core.documents import Document
+from langchain_core.tools import BaseTool
 from pydantic import BaseModel
 
-from backend.agent.graph import SplunkMCPAgent
+from backend.agent.graph import NoPendingApprovalError, SplunkMCPAgent
 from backend.mcp.server_manager import MCPServerManager
 from backend.rag.document_processor import DocumentProcessor
 from backend.rag.vectorstore import VectorStoreManager
+from backend.settings import settings
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Global references (will be set by main.py during startup)
-agent: SplunkMCPAgent | None = None
-vectorstore: VectorStoreManager | None = None
-document_processor: DocumentProcessor | None = None
-mcp_manager: MCPServerManager | None = None
+# Largest accepted upload, in bytes
+MAX_UPLOAD_BYTES = settings.max_upload_bytes
 
+# Number of chunks embedded and written to the vector store per batch
+INDEX_BATCH_SIZE = settings.index_batch_size
 
-def set_dependencies(
-    agent_instance: SplunkMCPAgent,
-    vectorstore_instance: VectorStoreManager,
-    doc_processor_instance: DocumentProcessor,
-    mcp_manager_instance: MCPServerManager | None = None,
-) -> None:
-    """
-    Set global dependencies for routes.
+# Vector store document count reported by /health, cached as (timestamp, count)
+_COUNT_TTL = 1.0
+_count_cache: tuple[float, int] | None = None
 
-    Called during FastAPI startup.
+# /conversation responses as (thread version, response), keyed by thread_id.
+# The version is bumped whenever this process runs the agent on the thread;
+# both maps are LRUs, and a thread dropped from one is dropped from the other.
+_CONVERSATION_CACHE_SIZE = 1024
+_conversation_cache: OrderedDict[str, tuple[int, dict]] = OrderedDict()
+_thread_versions: OrderedDict[str, int] = OrderedDict()
 
-    Args:
-        agent_instance: The LangGraph agent
-        vectorstore_instance: The vector store manager
-        doc_processor_instance: The document processor
-        mcp_manager_instance: The MCP server manager (optional)
-    """
-    global agent, vectorstore, document_processor, mcp_manager
-    agent = agent_instance
-    vectorstore = vectorstore_instance
-    document_processor = doc_processor_instance
-    mcp_manager = mcp_manager_instance
+# Markdown section separator used by /mcp and /tools
+_HR = "\n---\n\n"
+
+# Markdown line listing one tool
+_TOOL_LINE = "- **`%s`**  \n  %s\n"
+
+# Latest rendered /mcp and /tools output as (fingerprint, timestamp, text),
+# keyed by command. A changed fingerprint overwrites the entry, so there is at
+# most one per command; entries expire after _SLASH_TTL seconds
+_SLASH_TTL = 60.0
+_slash_cache: dict[str, tuple[tuple[int, ...], float, str]] = {}
+_slash_stats = {"hits": 0, "misses": 0}
+
+
+# Dependencies (instances are stored on app.state by main.py during startup)
+
+
+def get_agent(request: Request) -> SplunkMCPAgent | None:
+    """Get the LangGraph agent, or None before startup completes."""
+    return getattr(request.app.state, "agent", None)
+
+
+def get_vectorstore(request: Request) -> VectorStoreManager | None:
+    """Get the vector store manager, or None before startup completes."""
+    return getattr(request.app.state, "vectorstore", None)
+
+
+def get_document_processor(request: Request) -> DocumentProcessor | None:
+    """Get the document processor, or None before startup completes."""
+    return getattr(request.app.state, "document_processor", None)
+
+
+def get_mcp_manager(request: Request) -> MCPServerManager | None:
+    """Get the MCP server manager, or None if MCP is disabled."""
+    return getattr(request.app.state, "mcp_manager", None)
+
+
+AgentDep = Annotated[SplunkMCPAgent | None, Depends(get_agent)]
+VectorStoreDep = Annotated[VectorStoreManager | None, Depends(get_vectorstore)]
+DocumentProcessorDep = Annotated[DocumentProcessor | None, Depends(get_document_processor)]
+MCPManagerDep = Annotated[MCPServerManager | None, Depends(get_mcp_manager)]
 
 
 # Request/Response Models
@@ -125,46 +166,127 @@ class BulkUploadResponse(BaseModel):
 # Helper Functions
 
 
-async def handle_special_command(command: str, thread_id: str) -> ChatResponse:
+async def handle_special_command(
+    command: str,
+    thread_id: str,
+    agent: SplunkMCPAgent | None,
+    mcp_manager: MCPServerManager | None,
+) -> ChatResponse:
     """
     Handle special slash commands.
 
     Args:
         command: The command string (starting with /)
         thread_id: Current thread ID
+        agent: The LangGraph agent
+        mcp_manager: The MCP server manager (optional)
 
     Returns:
         ChatResponse with command output
     """
-    cmd = command.lower().strip()
-
-    if cmd == "/mcp":
-        return await get_mcp_info(thread_id)
-    elif cmd == "/tools":
-        return await get_tools_info(thread_id)
-    elif cmd == "/help":
-        return get_help_info(thread_id)
-    else:
-        return ChatResponse(
+    handler = _COMMANDS.get(command.lower().strip())
+    if handler is None:
+        return ChatResponse.model_construct(
             response=f"Unknown command: {command}\n\nType `/help` for available commands.",
             thread_id=thread_id,
             requires_approval=False,
             approval_details=None,
         )
 
+    return await handler(thread_id, agent, mcp_manager)
+
+
+def _slash_fingerprint(
+    agent: SplunkMCPAgent | None, mcp_manager: MCPServerManager | None
+) -> tuple[int, ...]:
+    """
+    Cheap fingerprint of the state rendered by /mcp and /tools.
+
+    The manager's tools generation changes whenever a server's tool list is
+    rebuilt (e.g. a server served from the tool cache connects and lists
+    different tools), even if the number of tools stays the same.
+    """
+    return (
+        id(agent),
+        id(mcp_manager),
+        len(mcp_manager.enabled_servers) if mcp_manager else 0,
+        mcp_manager.tools_generation if mcp_manager else 0,
+        len(agent.tools) if agent else 0,
+    )
+
+
+def _tool_lines(tools: list[BaseTool]) -> str:
+    """Render a Markdown list of tools in one join."""
+    return "".join(_TOOL_LINE % (tool.name, tool.description) for tool in tools)
+
+
+def _get_slash_cached(
+    command: str, agent: SplunkMCPAgent | None, mcp_manager: MCPServerManager | None
+) -> tuple[tuple[str, tuple[int, ...]], str | None]:
+    """
+    Look up a rendered slash command response.
+
+    Args:
+        command: Slash command name (e.g. "mcp")
+        agent: The LangGraph agent
+        mcp_manager: The MCP server manager (optional)
+
+    Returns:
+        Tuple of (cache key, cached text or None on a miss)
+    """
+    key = (command, _slash_fingerprint(agent, mcp_manager))
+    entry = _slash_cache.get(command)
+    if entry and entry[0] == key[1] and time.monotonic() - entry[1] < _SLASH_TTL:
+        _slash_stats["hits"] += 1
+        return key, entry[2]
+
+    _slash_stats["misses"] += 1
+    return key, None
+
+
+def _set_slash_cached(key: tuple[str, tuple[int, ...]], text: str) -> None:
+    """
+    Store a rendered slash command response, replacing the command's old one.
+
+    Args:
+        key: Cache key returned by _get_slash_cached
+        text: Rendered response
+    """
+    command, fingerprint = key
+    _slash_cache[command] = (fingerprint, time.monotonic(), text)
+
+
+def clear_slash_cache() -> None:
+    """Drop every rendered slash command response."""
+    _slash_cache.clear()
+
+
+def get_cache_stats() -> dict[str, int]:
+    """
+    Get hit/miss counters for the slash command cache.
+
+    Returns:
+        Dictionary with hits, misses and current entry count
+    """
+    return {**_slash_stats, "entries": len(_slash_cache)}
+
+
+_MCP_DISABLED_TEXT = (
+    "### 🔌 MCP Server Status: Not Enabled\n\n"
+    "MCP servers are currently disabled. To enable:\n\n"
+    "1. Configure servers in `config/mcp_servers.json`\n"
+    "2. Uncomment MCP initialization in `backend/main.py`\n"
+    "3. Restart the backend"
+)
 
-async def get_mcp_info(thread_id: str) -> ChatResponse:
+
+async def get_mcp_info(
+    thread_id: str, agent: SplunkMCPAgent | None, mcp_manager: MCPServerManager | None
+) -> ChatResponse:
     """Get MCP server and tools information."""
     if not mcp_manager:
-        response = (
-            "### 🔌 MCP Server Status: Not Enabled\n\n"
-            "MCP servers are currently disabled. To enable:\n\n"
-            "1. Configure servers in `config/mcp_servers.json`\n"
-            "2. Uncomment MCP initialization in `backend/main.py`\n"
-            "3. Restart the backend"
-        )
-        return ChatResponse(
-            response=response,
+        return ChatResponse.model_construct(
+            response=_MCP_DISABLED_TEXT,
             thread_id=thread_id,
             requires_approval=False,
             approval_details=None,
@@ -172,100 +294,122 @@ async def get_mcp_info(thread_id: str) -> ChatResponse:
 
     # Get MCP server information
     enabled_servers = mcp_manager.enabled_servers
+    cache_key, cached = _get_slash_cached("mcp", agent, mcp_manager)
+    if cached is not None:
+        return ChatResponse.model_construct(
+            response=cached,
+            thread_id=thread_id,
+            requires_approval=False,
+            approval_details=None,
+        )
+
     all_tools = mcp_manager.get_all_tools()
 
-    response_parts = ["### 🔌 MCP Servers\n"]
+    buf = io.StringIO()
+    buf.write("### 🔌 MCP Servers\n\n")
 
     if not enabled_servers:
-        response_parts.append("No MCP servers are currently enabled.\n")
+        buf.write("No MCP servers are currently enabled.\n\n")
     else:
-        response_parts.append(f"**Enabled Servers:** {len(enabled_servers)} | **Total Tools:** {len(all_tools)}\n")
-        
+        buf.write(
+            f"**Enabled Servers:** {len(enabled_servers)} | **Total Tools:** {len(all_tools)}\n\n"
+        )
+
         for server_name, server_config in enabled_servers.items():
             server_tools = mcp_manager.get_tools_by_server(server_name)
-            
-            response_parts.append(f"\n---\n")
-            response_parts.append(f"#### 🔧 {server_name}")
-            response_parts.append(f"- **Command:** `{server_config.command}`")
-            response_parts.append(f"- **Tools Available:** {len(server_tools)}\n")
+
+            buf.write(_HR)
+            buf.write(f"#### 🔧 {server_name}\n")
+            buf.write(f"- **Command:** `{server_config.command}`\n")
+            buf.write(f"- **Tools Available:** {len(server_tools)}\n\n")
 
             if server_tools:
-                response_parts.append("**Available Tools:**\n")
-                for tool in server_tools:  # Show all tools
-                    response_parts.append(f"- **`{tool.name}`**  \n  {tool.description}")
+                buf.write("**Available Tools:**\n\n")
+                buf.write(_tool_lines(server_tools))  # Show all tools
 
-    response_parts.append("\n---\n")
-    response_parts.append(f"💡 **Tip:** Use `/tools` to see all {len(all_tools)} tools grouped by type")
+    buf.write(_HR)
+    buf.write(f"💡 **Tip:** Use `/tools` to see all {len(all_tools)} tools grouped by type")
 
-    return ChatResponse(
-        response="\n".join(response_parts),
+    response = buf.getvalue()
+    _set_slash_cached(cache_key, response)
+    return ChatResponse.model_construct(
+        response=response,
         thread_id=thread_id,
         requires_approval=False,
         approval_details=None,
     )
 
 
-async def get_tools_info(thread_id: str) -> ChatResponse:
+async def get_tools_info(
+    thread_id: str, agent: SplunkMCPAgent | None, mcp_manager: MCPServerManager | None
+) -> ChatResponse:
     """Get all available tools information."""
     if not agent:
-        return ChatResponse(
+        return ChatResponse.model_construct(
             response="Agent not initialized.",
             thread_id=thread_id,
             requires_approval=False,
             approval_details=None,
         )
 
+    cache_key, cached = _get_slash_cached("tools", agent, mcp_manager)
+    if cached is not None:
+        return ChatResponse.model_construct(
+            response=cached,
+            thread_id=thread_id,
+            requires_approval=False,
+            approval_details=None,
+        )
+
     tools = agent.tools
-    response_parts = ["### 🛠️ Available Tools\n"]
-    response_parts.append(f"**Total:** {len(tools)} tools\n")
+    buf = io.StringIO()
+    buf.write("### 🛠️ Available Tools\n\n")
+    buf.write(f"**Total:** {len(tools)} tools\n\n")
 
-    # Group tools by type
-    mcp_tools = [t for t in tools if "-" in t.name and "_" in t.name]
-    rag_tools = [t for t in tools if "retrieve" in t.name.lower() or "search" in t.name.lower()]
-    other_tools = [t for t in tools if t not in mcp_tools and t not in rag_tools]
+    # Tool categories are computed once when the agent is built
+    categories = agent.tools_by_category
+    mcp_tools = categories["mcp"]
+    rag_tools = categories["rag"]
+    other_tools = categories["other"]
 
     if mcp_tools:
-        response_parts.append(f"\n---\n")
-        response_parts.append(f"#### 🔧 MCP Tools ({len(mcp_tools)})\n")
-        
+        buf.write(_HR)
+        buf.write(f"#### 🔧 MCP Tools ({len(mcp_tools)})\n\n")
+
         # Group MCP tools by server
-        from collections import defaultdict
         by_server = defaultdict(list)
         for tool in mcp_tools:
             server_name = tool.name.split("_")[0] if "_" in tool.name else "unknown"
             by_server[server_name].append(tool)
-        
-        for server_name, server_tools in by_server.items():
-            response_parts.append(f"\n**{server_name}** ({len(server_tools)} tools):")
-            for tool in server_tools:
-                response_parts.append(f"- **`{tool.name}`**  \n  {tool.description}")
+
+        for server_name, server_tools in sorted(by_server.items()):
+            buf.write(f"\n**{server_name}** ({len(server_tools)} tools):\n")
+            buf.write(_tool_lines(server_tools))
 
     if rag_tools:
-        response_parts.append(f"\n---\n")
-        response_parts.append(f"#### 📚 RAG Tools ({len(rag_tools)})\n")
-        for tool in rag_tools:
-            response_parts.append(f"- **`{tool.name}`**  \n  {tool.description}")
+        buf.write(_HR)
+        buf.write(f"#### 📚 RAG Tools ({len(rag_tools)})\n\n")
+        buf.write(_tool_lines(rag_tools))
 
     if other_tools:
-        response_parts.append(f"\n---\n")
-        response_parts.append(f"#### ⚙️ Other Tools ({len(other_tools)})\n")
-        for tool in other_tools:
-            response_parts.append(f"- **`{tool.name}`**  \n  {tool.description}")
-    
-    response_parts.append("\n---\n")
-    response_parts.append("💡 **Tip:** Ask natural questions and I'll choose the right tools automatically!")
+        buf.write(_HR)
+        buf.write(f"#### ⚙️ Other Tools ({len(other_tools)})\n\n")
+        buf.write(_tool_lines(other_tools))
 
-    return ChatResponse(
-        response="\n".join(response_parts),
+    buf.write(_HR)
+    buf.write("💡 **Tip:** Ask natural questions and I'll choose the right tools automatically!")
+
+    response = buf.getvalue()
+    _set_slash_cached(cache_key, response)
+    return ChatResponse.model_construct(
+        response=response,
         thread_id=thread_id,
         requires_approval=False,
         approval_details=None,
     )
 
 
-def get_help_info(thread_id: str) -> ChatResponse:
-    """Get help information about available commands."""
-    response = """### 💬 Help & Commands
+_HELP_TEXT = """### 💬 Help & Commands
 
 #### Slash Commands
 
@@ -311,25 +455,207 @@ Upload PDFs, TXT, or DOCX files using the sidebar to add them to the knowledge b
 💡 **Tip:** For sensitive operations (like running Splunk queries), you'll be prompted to approve before execution.
 """
 
-    return ChatResponse(
-        response=response,
+
+async def get_help_info(
+    thread_id: str, _agent: SplunkMCPAgent | None, _mcp_manager: MCPServerManager | None
+) -> ChatResponse:
+    """Get help information about available commands."""
+    return ChatResponse.model_construct(
+        response=_HELP_TEXT,
         thread_id=thread_id,
         requires_approval=False,
         approval_details=None,
     )
 
 
+# Slash command handlers, keyed by command
+_COMMANDS: dict[
+    str,
+    Callable[[str, SplunkMCPAgent | None, MCPServerManager | None], Awaitable[ChatResponse]],
+] = {
+    "/mcp": get_mcp_info,
+    "/tools": get_tools_info,
+    "/help": get_help_info,
+}
+
+
+def extract_approval(result: dict[str, Any]) -> tuple[bool, dict | None]:
+    """
+    Extract pending approval information from an agent result.
+
+    Args:
+        result: Final agent state
+
+    Returns:
+        Tuple of (requires_approval, approval_details)
+    """
+    # Check if there's a pending approval
+    requires_approval = result.get("pending_approval", False)
+    approval_details = result.get("approval_request")
+
+    # Check for interrupts (HITL)
+    if "__interrupt__" in result:
+        requires_approval = True
+        interrupts = result["__interrupt__"]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Interrupt detected. Type: %s", type(interrupts))
+
+        # interrupts is a list of Interrupt objects whose .value holds the data
+        try:
+            value = interrupts[0].value
+            approval_details = value if isinstance(value, dict) else {"value": value}
+        except (TypeError, IndexError, AttributeError, KeyError):
+            approval_details = {
+                "message": "Action requires approval",
+                "interrupts": repr(interrupts),
+            }
+
+    return requires_approval, approval_details
+
+
+def build_chat_response(result: dict[str, Any], thread_id: str) -> ChatResponse:
+    """
+    Build a chat response from the final agent state.
+
+    Args:
+        result: Final agent state
+        thread_id: Conversation thread ID
+
+    Returns:
+        ChatResponse with the last message and any pending approval
+
+    Raises:
+        HTTPException: If the agent produced no messages
+    """
+    messages = result.get("messages")
+    if not messages:
+        raise HTTPException(status_code=500, detail="No response from agent")
+
+    last_message = messages[-1]
+    content = getattr(last_message, "content", None)
+    requires_approval, approval_details = extract_approval(result)
+
+    return ChatResponse(
+        response=content if content is not None else str(last_message),
+        thread_id=thread_id,
+        requires_approval=requires_approval,
+        approval_details=approval_details,
+    )
+
+
+def check_upload_size(file: UploadFile) -> None:
+    """
+    Reject uploads larger than MAX_UPLOAD_BYTES.
+
+    Requests declaring an oversized body are already refused by
+    ``UploadSizeLimitMiddleware``; this catches the rest once spooled.
+
+    Args:
+        file: Uploaded file
+
+    Raises:
+        HTTPException: If the file exceeds the size limit
+    """
+    size = file.size
+    if size is None:
+        # Size not reported by the client; measure the spooled file
+        size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(0)
+
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large: {size} bytes (limit is {MAX_UPLOAD_BYTES} bytes)",
+        )
+
+
+async def index_documents(vectorstore: VectorStoreManager, chunks: list[Document]) -> None:
+    """
+    Add document chunks to the vector store in concurrently embedded batches.
+
+    Batches of INDEX_BATCH_SIZE chunks are embedded through the async
+    embeddings API and written to Chroma in worker threads, so embedding
+    requests overlap with each other and with writes.
+
+    Args:
+        vectorstore: The vector store manager
+        chunks: Document chunks to add
+    """
+    await vectorstore.aadd_documents(chunks, batch_size=INDEX_BATCH_SIZE)
+
+
+def _touch_thread(thread_id: str) -> None:
+    """Invalidate cached /conversation responses for a thread."""
+    _thread_versions[thread_id] = _thread_versions.get(thread_id, 0) + 1
+    _thread_versions.move_to_end(thread_id)
+    if len(_thread_versions) > _CONVERSATION_CACHE_SIZE:
+        # A forgotten thread restarts at version 0, so its cached response must go too
+        evicted, _ = _thread_versions.popitem(last=False)
+        _conversation_cache.pop(evicted, None)
+
+
+def _sse(payload: dict[str, Any]) -> str:
+    """Format a payload as a server-sent event."""
+    return f"data: {orjson.dumps(payload, default=str).decode()}\n\n"
+
+
+async def token_stream(
+    agent_instance: SplunkMCPAgent, message: str, thread_id: str
+) -> AsyncIterator[str]:
+    """
+    Stream an agent run as server-sent events.
+
+    Emits ``{"token": ...}`` events for model output as it is generated and
+    a terminal ``{"done": true, ...}`` event carrying the final response and
+    any pending approval (or ``{"error": ...}`` if the run fails).
+
+    Args:
+        agent_instance: The LangGraph agent
+        message: User message
+        thread_id: Conversation thread ID
+
+    Yields:
+        Server-sent event strings
+    """
+    final_state: dict[str, Any] = {}
+
+    try:
+        async for mode, payload in agent_instance.astream(
+            message, thread_id, stream_mode=["messages", "values"]
+        ):
+            if mode == "messages":
+                chunk, metadata = payload
+                if metadata.get("langgraph_node") == "call_model" and chunk.content:
+                    yield _sse({"token": chunk.content})
+            else:
+                final_state = payload
+
+        response = build_chat_response(final_state, thread_id)
+        yield _sse({"done": True, **response.model_dump()})
+
+    except Exception as e:
+        logger.error("Error during streaming chat: %s", e, exc_info=True)
+        yield _sse({"error": str(e), "thread_id": thread_id})
+
+    finally:
+        _touch_thread(thread_id)
+
+
 # Routes
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+async def health_check(
+    agent: AgentDep, vectorstore: VectorStoreDep, document_processor: DocumentProcessorDep
+) -> HealthResponse:
     """
     Health check endpoint.
 
     Returns:
         Health status of the application
     """
+    global _count_cache
     components = {}
 
     if agent:
@@ -339,7 +665,12 @@ async def health_check() -> HealthResponse:
 
     if vectorstore:
         try:
-            count = vectorstore.get_collection_count()
+            now = time.monotonic()
+            if _count_cache and now - _count_cache[0] < _COUNT_TTL:
+                count = _count_cache[1]
+            else:
+                count = await asyncio.to_thread(vectorstore.get_collection_count)
+                _count_cache = (now, count)
             components["vectorstore"] = f"healthy ({count} documents)"
         except Exception as e:
             components["vectorstore"] = f"error: {str(e)}"
@@ -360,11 +691,27 @@ async def health_check() -> HealthResponse:
     )
 
 
+@router.get("/cache-stats")
+async def cache_stats() -> dict:
+    """
+    Get slash command cache statistics.
+
+    Returns:
+        Cache hit/miss counters
+    """
+    return get_cache_stats()
+
+
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+async def chat(
+    request: ChatRequest, http_request: Request, agent: AgentDep, mcp_manager: MCPManagerDep
+) -> ChatResponse | StreamingResponse:
     """
     Chat with the agent.
 
+    Clients sending ``Accept: text/event-stream`` receive the reply as
+    server-sent events (see ``token_stream``); others get a JSON response.
+
     Special commands:
     - /mcp - List MCP servers and tools
     - /tools - List all available tools
@@ -372,9 +719,10 @@ async def chat(request: ChatRequest) -> ChatResponse:
 
     Args:
         request: Chat request with message and optional thread_id
+        http_request: Incoming HTTP request, used for content negotiation
 
     Returns:
-        Agent response
+        Agent response, or an event stream of it
 
     Raises:
         HTTPException: If agent is not initialized or error occurs
@@ -383,79 +731,44 @@ async def chat(request: ChatRequest) -> ChatResponse:
         raise HTTPException(status_code=503, detail="Agent not initialized")
 
     # Generate thread_id if not provided
-    thread_id = request.thread_id or str(uuid.uuid4())
-
-    logger.info(f"Chat request on thread {thread_id}: {request.message[:100]}...")
-
-    # Handle special commands
-    if request.message.strip().startswith("/"):
-        return await handle_special_command(request.message.strip(), thread_id)
+    thread_id = request.thread_id or secrets.token_hex(16)
+
+    logger.info("Chat request on thread %s: %.100s...", thread_id, request.message)
+
+    # Handle special commands; find the first non-whitespace character rather
+    # than stripping (and copying) every message
+    message = request.message
+    i, n = 0, len(message)
+    while i < n and message[i] in " \t\r\n":
+        i += 1
+    if i < n and message[i] == "/":
+        return await handle_special_command(message[i:].strip(), thread_id, agent, mcp_manager)
+
+    # Stream tokens as server-sent events when the client asks for them;
+    # other clients keep getting a single JSON response
+    if "text/event-stream" in http_request.headers.get("accept", ""):
+        return StreamingResponse(
+            token_stream(agent, request.message, thread_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     try:
         # Invoke the agent
         result = await agent.ainvoke(request.message, thread_id)
 
-        # Extract the last message
-        messages = result.get("messages", [])
-        if not messages:
-            raise HTTPException(status_code=500, detail="No response from agent")
-
-        last_message = messages[-1]
-        response_text = (
-            last_message.content if hasattr(last_message, "content") else str(last_message)
-        )
-
-        # Check if there's a pending approval
-        requires_approval = result.get("pending_approval", False)
-        approval_details = result.get("approval_request")
-
-        # Check for interrupts (HITL)
-        if "__interrupt__" in result:
-            requires_approval = True
-            interrupts = result["__interrupt__"]
-            
-            logger.info(f"Interrupt detected. Type: {type(interrupts)}")
-            
-            # interrupts is a list of Interrupt objects
-            # Extract the value from the first interrupt and ensure it's a dict
-            if isinstance(interrupts, list) and len(interrupts) > 0:
-                interrupt_obj = interrupts[0]
-                logger.debug(f"Interrupt object type: {type(interrupt_obj)}")
-                
-                # The interrupt object has a .value attribute containing the actual data
-                if hasattr(interrupt_obj, "value"):
-                    value = interrupt_obj.value
-                    # Ensure it's a dict
-                    if isinstance(value, dict):
-                        approval_details = value
-                    else:
-                        approval_details = {"value": value}
-                    logger.debug(f"Approval details extracted: {approval_details}")
-                else:
-                    approval_details = {
-                        "message": "Action requires approval",
-                        "raw_interrupt": str(interrupt_obj)
-                    }
-            else:
-                approval_details = {
-                    "message": "Action requires approval", 
-                    "interrupts": str(interrupts)
-                }
-
-        return ChatResponse(
-            response=response_text,
-            thread_id=thread_id,
-            requires_approval=requires_approval,
-            approval_details=approval_details,
-        )
+        return build_chat_response(result, thread_id)
 
     except Exception as e:
-        logger.error(f"Error during chat: {e}", exc_info=True)
+        logger.error("Error during chat: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+    finally:
+        _touch_thread(thread_id)
+
 
 @router.post("/approve-action")
-async def approve_action(request: ApprovalRequest) -> dict:
+async def approve_action(request: ApprovalRequest, agent: AgentDep) -> dict:
     """
     Approve or reject a pending action.
 
@@ -466,20 +779,17 @@ async def approve_action(request: ApprovalRequest) -> dict:
         Result of continuing execution
 
     Raises:
-        HTTPException: If agent is not initialized or error occurs
+        HTTPException: If agent is not initialized, the thread has no pending
+            approval, or an error occurs
     """
     if not agent:
         raise HTTPException(status_code=503, detail="Agent not initialized")
 
-    logger.info(f"Approval decision for thread {request.thread_id}")
+    logger.info("Approval decision for thread %s", request.thread_id)
 
     try:
         # Resume the agent with the approval decision
-        config = {"configurable": {"thread_id": request.thread_id}}
-
-        from langgraph.types import Command
-
-        result = await agent.graph.ainvoke(Command(resume={"decisions": request.decisions}), config)
+        result = await agent.resume(request.thread_id, request.decisions)
 
         # Extract response
         messages = result.get("messages", [])
@@ -496,13 +806,25 @@ async def approve_action(request: ApprovalRequest) -> dict:
             "thread_id": request.thread_id,
         }
 
+    except NoPendingApprovalError as e:
+        # Double-clicked or retried decision for an already resumed thread
+        logger.warning("Approval rejected: %s", e)
+        raise HTTPException(status_code=409, detail=str(e))
+
     except Exception as e:
-        logger.error(f"Error during approval: {e}", exc_info=True)
+        logger.error("Error during approval: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+    finally:
+        _touch_thread(request.thread_id)
+
 
 @router.post("/upload-bulk", response_model=BulkUploadResponse)
-async def upload_documents_bulk(files: list[UploadFile] = File(...)) -> BulkUploadResponse:
+async def upload_documents_bulk(
+    vectorstore: VectorStoreDep,
+    document_processor: DocumentProcessorDep,
+    files: list[UploadFile] = File(...),
+) -> BulkUploadResponse:
     """
     Upload multiple documents for RAG indexing.
 
@@ -518,7 +840,7 @@ async def upload_documents_bulk(files: list[UploadFile] = File(...)) -> BulkUplo
     if not document_processor or not vectorstore:
         raise HTTPException(status_code=503, detail="Document processing not initialized")
 
-    logger.info(f"Bulk document upload: {len(files)} files")
+    logger.info("Bulk document upload: %d files", len(files))
 
     results = []
     total_uploaded = 0
@@ -527,12 +849,12 @@ async def upload_documents_bulk(files: list[UploadFile] = File(...)) -> BulkUplo
 
     for file in files:
         filename = file.filename or "unknown"
-        logger.info(f"Processing file: {filename}")
+        logger.info("Processing file: %s", filename)
 
         try:
             # Check for duplicates
-            if vectorstore.check_document_exists(filename):
-                logger.warning(f"Duplicate document skipped: {filename}")
+            if await asyncio.to_thread(vectorstore.check_document_exists, filename):
+                logger.warning("Duplicate document skipped: %s", filename)
                 results.append(
                     BulkUploadResult(
                         filename=filename,
@@ -544,16 +866,16 @@ async def upload_documents_bulk(files: list[UploadFile] = File(...)) -> BulkUplo
                 total_skipped += 1
                 continue
 
-            # Read file content
-            content = await file.read()
-
-            # Process document
-            chunks = document_processor.process_from_bytes(content, filename)
+            # Process document straight from the spooled upload
+            check_upload_size(file)
+            chunks = await asyncio.to_thread(
+                document_processor.process_from_bytes, file.file, filename
+            )
 
             # Add to vector store
-            vectorstore.add_documents(chunks)
+            await index_documents(vectorstore, chunks)
 
-            logger.info(f"Successfully processed {filename}: {len(chunks)} chunks created")
+            logger.info("Successfully processed %s: %d chunks created", filename, len(chunks))
 
             results.append(
                 BulkUploadResult(
@@ -565,9 +887,22 @@ async def upload_documents_bulk(files: list[UploadFile] = File(...)) -> BulkUplo
             )
             total_uploaded += 1
 
+        except HTTPException as e:
+            # Upload too large
+            logger.warning("Rejected upload: %s - %s", filename, e.detail)
+            results.append(
+                BulkUploadResult(
+                    filename=filename,
+                    success=False,
+                    message=str(e.detail),
+                    chunks_created=0,
+                )
+            )
+            total_failed += 1
+
         except ValueError as e:
             # Unsupported file format
-            logger.warning(f"Unsupported file format: {filename} - {e}")
+            logger.warning("Unsupported file format: %s - %s", filename, e)
             results.append(
                 BulkUploadResult(
                     filename=filename,
@@ -579,7 +914,7 @@ async def upload_documents_bulk(files: list[UploadFile] = File(...)) -> BulkUplo
             total_failed += 1
 
         except Exception as e:
-            logger.error(f"Error processing {filename}: {e}", exc_info=True)
+            logger.error("Error processing %s: %s", filename, e, exc_info=True)
             results.append(
                 BulkUploadResult(
                     filename=filename,
@@ -599,7 +934,11 @@ async def upload_documents_bulk(files: list[UploadFile] = File(...)) -> BulkUplo
 
 
 @router.post("/upload", response_model=UploadResponse)
-async def upload_document(file: UploadFile = File(...)) -> UploadResponse:
+async def upload_document(
+    vectorstore: VectorStoreDep,
+    document_processor: DocumentProcessorDep,
+    file: UploadFile = File(...),
+) -> UploadResponse:
     """
     Upload a document for RAG indexing.
 
@@ -616,27 +955,27 @@ async def upload_document(file: UploadFile = File(...)) -> UploadResponse:
         raise HTTPException(status_code=503, detail="Document processing not initialized")
 
     filename = file.filename or "unknown"
-    logger.info(f"Document upload: {filename}")
+    logger.info("Document upload: %s", filename)
 
     try:
         # Check for duplicates
-        if vectorstore.check_document_exists(filename):
-            logger.warning(f"Duplicate document rejected: {filename}")
+        if await asyncio.to_thread(vectorstore.check_document_exists, filename):
+            logger.warning("Duplicate document rejected: %s", filename)
             raise HTTPException(
                 status_code=409,
                 detail=f"Document already exists: {filename}. Please delete the existing document first or use a different filename.",
             )
 
-        # Read file content
-        content = await file.read()
-
-        # Process document
-        chunks = document_processor.process_from_bytes(content, filename)
+        # Process document straight from the spooled upload
+        check_upload_size(file)
+        chunks = await asyncio.to_thread(
+            document_processor.process_from_bytes, file.file, filename
+        )
 
         # Add to vector store
-        vectorstore.add_documents(chunks)
+        await index_documents(vectorstore, chunks)
 
-        logger.info(f"Successfully processed {filename}: {len(chunks)} chunks created")
+        logger.info("Successfully processed %s: %d chunks created", filename, len(chunks))
 
         return UploadResponse(
             success=True,
@@ -650,16 +989,16 @@ async def upload_document(file: UploadFile = File(...)) -> UploadResponse:
         raise
     except ValueError as e:
         # Unsupported file format
-        logger.warning(f"Unsupported file format: {filename}")
+        logger.warning("Unsupported file format: %s", filename)
         raise HTTPException(status_code=400, detail=str(e))
 
     except Exception as e:
-        logger.error(f"Error processing upload: {e}", exc_info=True)
+        logger.error("Error processing upload: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
 @router.get("/conversation/{thread_id}")
-async def get_conversation(thread_id: str) -> dict:
+async def get_conversation(thread_id: str, agent: AgentDep) -> dict:
     """
     Get conversation state for a thread.
 
@@ -675,34 +1014,52 @@ async def get_conversation(thread_id: str) -> dict:
     if not agent:
         raise HTTPException(status_code=503, detail="Agent not initialized")
 
+    version = _thread_versions.get(thread_id, 0)
+    cached = _conversation_cache.get(thread_id)
+    if cached is not None and cached[0] == version:
+        _conversation_cache.move_to_end(thread_id)
+        return cached[1]
+
     try:
-        state = agent.get_state(thread_id)
+        state = await agent.aget_state(thread_id)
 
         # Extract messages
         messages = []
-        if state and "values" in state:
-            state_messages = state["values"].get("messages", [])
-            for msg in state_messages:
-                messages.append(
-                    {
-                        "type": msg.__class__.__name__,
-                        "content": msg.content if hasattr(msg, "content") else str(msg),
-                    }
-                )
+        if state and state.values:
+            messages = [
+                {
+                    "type": type(msg).__name__,
+                    "content": (
+                        content
+                        if (content := getattr(msg, "content", None)) is not None
+                        else str(msg)
+                    ),
+                }
+                for msg in state.values.get("messages", [])
+            ]
 
-        return {
+        conversation = {
             "thread_id": thread_id,
             "messages": messages,
             "state": state,
         }
 
     except Exception as e:
-        logger.error(f"Error retrieving conversation: {e}", exc_info=True)
+        logger.error("Error retrieving conversation: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+    # Only cache if the thread wasn't updated while the state was read
+    if version == _thread_versions.get(thread_id, 0):
+        _conversation_cache[thread_id] = (version, conversation)
+        _conversation_cache.move_to_end(thread_id)
+        if len(_conversation_cache) > _CONVERSATION_CACHE_SIZE:
+            _conversation_cache.popitem(last=False)
+
+    return conversation
+
 
 @router.get("/documents", response_model=DocumentListResponse)
-async def list_documents() -> DocumentListResponse:
+async def list_documents(vectorstore: VectorStoreDep) -> DocumentListResponse:
     """
     Get list of all documents in the vector store.
 
@@ -716,7 +1073,7 @@ async def list_documents() -> DocumentListResponse:
         raise HTTPException(status_code=503, detail="Vector store not initialized")
 
     try:
-        documents = vectorstore.get_document_list()
+        documents = await asyncio.to_thread(vectorstore.get_document_list)
 
         return DocumentListResponse(
             documents=[DocumentInfo(**doc) for doc in documents],
@@ -724,12 +1081,12 @@ async def list_documents() -> DocumentListResponse:
         )
 
     except Exception as e:
-        logger.error(f"Error listing documents: {e}", exc_info=True)
+        logger.error("Error listing documents: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/documents/{source_filename}")
-async def delete_document(source_filename: str) -> dict:
+async def delete_document(source_filename: str, vectorstore: VectorStoreDep) -> dict:
     """
     Delete a specific document from the vector store.
 
@@ -745,15 +1102,15 @@ async def delete_document(source_filename: str) -> dict:
     if not vectorstore:
         raise HTTPException(status_code=503, detail="Vector store not initialized")
 
-    logger.info(f"Delete request for document: {source_filename}")
+    logger.info("Delete request for document: %s", source_filename)
 
     try:
         # URL decode the filename (FastAPI does this automatically, but being explicit)
-        from urllib.parse import unquote
-
         decoded_filename = unquote(source_filename)
 
-        chunks_deleted = vectorstore.delete_document_by_source(decoded_filename)
+        chunks_deleted = await asyncio.to_thread(
+            vectorstore.delete_document_by_source, decoded_filename
+        )
 
         if chunks_deleted == 0:
             raise HTTPException(status_code=404, detail=f"Document not found: {decoded_filename}")
@@ -767,12 +1124,12 @@ async def delete_document(source_filename: str) -> dict:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting document: {e}", exc_info=True)
+        logger.error("Error deleting document: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/documents")
-async def clear_documents() -> dict:
+async def clear_documents(vectorstore: VectorStoreDep) -> dict:
     """
     Clear all documents from the vector store.
 
@@ -786,7 +1143,7 @@ async def clear_documents() -> dict:
         raise HTTPException(status_code=503, detail="Vector store not initialized")
 
     try:
-        vectorstore.clear_documents()
+        await asyncio.to_thread(vectorstore.clear_documents)
 
         return {
             "success": True,
@@ -794,5 +1151,5 @@ async def clear_documents() -> dict:
         }
 
     except Exception as e:
-        logger.error(f"Error clearing documents: {e}", exc_info=True)
+        logger.error("Error clearing documents: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
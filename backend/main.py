@@ -1,29 +1,35 @@
 """FastAPI main application with LangSmith integration."""
 
+import asyncio
 import logging
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 
+from anyio import to_thread
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 # Load environment variables from .env file
 load_dotenv()
 
 from backend.agent.graph import create_agent
-from backend.agent.tools import create_rag_tool
+from backend.agent.tools import create_mcp_describe_tool, create_rag_tool
 from backend.api import routes
+from backend.api.middleware import UploadSizeLimitMiddleware
 from backend.mcp.config import load_mcp_config
 from backend.mcp.server_manager import MCPServerManager
 from backend.rag.document_processor import DocumentProcessor
 from backend.rag.vectorstore import create_vectorstore
+from backend.settings import settings
 
 # Configure logging
 logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
+    level=settings.log_level,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
@@ -35,7 +41,7 @@ agent_instance = None
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI):
+async def lifespan(fastapi_app: FastAPI):
     """
     Lifespan context manager for FastAPI application.
 
@@ -46,18 +52,30 @@ async def lifespan(_app: FastAPI):
 
     global mcp_manager, vectorstore_manager, agent_instance
 
+    doc_processor = None
+
+    # Bound the worker threads used for blocking work (document parsing,
+    # Chroma calls) so concurrent uploads don't oversubscribe the CPU.
+    # asyncio.to_thread uses the loop's default executor; sync routes use
+    # anyio's limiter.
+    threadpool_size = settings.fastapi_threadpool
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=threadpool_size, thread_name_prefix="worker")
+    )
+    to_thread.current_default_thread_limiter().total_tokens = threadpool_size
+
     try:
         # Configure LangSmith tracing
-        os.environ["LANGCHAIN_TRACING_V2"] = os.getenv("LANGCHAIN_TRACING_V2", "true")
-        os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGCHAIN_PROJECT", "splunk-mcp-agent")
+        os.environ["LANGCHAIN_TRACING_V2"] = settings.langchain_tracing_v2
+        os.environ["LANGCHAIN_PROJECT"] = settings.langchain_project
 
-        if os.getenv("LANGCHAIN_API_KEY"):
+        if settings.langchain_api_key:
             logger.info("LangSmith tracing enabled")
         else:
             logger.warning("LANGCHAIN_API_KEY not set, tracing will be disabled")
 
         # Initialize vector store
-        persist_dir = os.getenv("CHROMA_PERSIST_DIR", "./data/chroma_db")
+        persist_dir = settings.chroma_persist_dir
         logger.info(f"Initializing vector store at {persist_dir}")
         vectorstore_manager = create_vectorstore(persist_directory=persist_dir)
 
@@ -73,7 +91,7 @@ async def lifespan(_app: FastAPI):
         if config_path.exists():
             logger.info(f"Loading MCP configuration from {config_path}")
             mcp_config = load_mcp_config(config_path)
-            mcp_manager = MCPServerManager(mcp_config)
+            mcp_manager = MCPServerManager(mcp_config, tool_cache_path=settings.mcp_tool_cache_path)
             await mcp_manager.initialize()
         else:
             logger.warning(
@@ -96,20 +114,49 @@ async def lifespan(_app: FastAPI):
             tools.extend(mcp_tools)
             logger.info(f"Added {len(mcp_tools)} MCP tool(s)")
 
+            # MCP tool descriptions are summarized; let the model read the full text
+            describe_tool = create_mcp_describe_tool(mcp_manager)
+            tools.append(describe_tool)
+
         # Create agent
-        checkpoint_dir = os.getenv("CHECKPOINT_DIR", "./data/checkpoints")
-        Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
-        checkpoint_path = f"{checkpoint_dir}/agent.db"
+        checkpointer_backend = settings.checkpointer_backend
+        if checkpointer_backend == "postgres":
+            if not settings.postgres_uri:
+                raise ValueError("POSTGRES_URI must be set when CHECKPOINTER_BACKEND=postgres")
+            checkpoint_path = settings.postgres_uri
+        else:
+            checkpoint_dir = settings.checkpoint_dir
+            Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+            checkpoint_path = f"{checkpoint_dir}/agent.db"
 
-        model_name = os.getenv("OPENAI_MODEL", "gpt-4o")
+        model_name = settings.openai_model
         logger.info(f"Creating agent with model {model_name} and {len(tools)} tool(s)")
 
         agent_instance = create_agent(
-            tools=tools, model_name=model_name, checkpoint_path=checkpoint_path
+            tools=tools,
+            model_name=model_name,
+            checkpoint_path=checkpoint_path,
+            checkpointer_backend=checkpointer_backend,
         )
+        await agent_instance.setup()
+
+        if mcp_manager:
+            # Servers served from the tool cache may list different tools once
+            # they connect; rebind the agent when they do
+            def refresh_tools(agent=agent_instance, manager=mcp_manager) -> None:
+                agent.set_tools([rag_tool, *manager.get_all_tools(), describe_tool])
+                logger.info("Refreshed agent tools after MCP tool list change")
 
-        # Set dependencies for routes
-        routes.set_dependencies(agent_instance, vectorstore_manager, doc_processor, mcp_manager)
+            mcp_manager.add_tools_listener(refresh_tools)
+
+        # Expose dependencies to routes
+        fastapi_app.state.agent = agent_instance
+        fastapi_app.state.vectorstore = vectorstore_manager
+        fastapi_app.state.document_processor = doc_processor
+        fastapi_app.state.mcp_manager = mcp_manager
+
+        # Drop slash command output rendered for a previous agent or manager
+        routes.clear_slash_cache()
 
         logger.info("Application startup complete")
 
@@ -125,6 +172,12 @@ async def lifespan(_app: FastAPI):
     if mcp_manager:
         await mcp_manager.shutdown()
 
+    if agent_instance:
+        await agent_instance.aclose()
+
+    if doc_processor:
+        doc_processor.close()
+
     logger.info("Application shutdown complete")
 
 
@@ -134,24 +187,35 @@ app = FastAPI(
     description="LangGraph agent with Splunk MCP integration, RAG, and human-in-the-loop",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=os.getenv("CORS_ORIGINS", "*").split(","),
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Refuse oversized uploads before Starlette spools them; the routes re-check
+# each file's actual size. A single upload may carry some multipart framing.
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/api/v1/upload": settings.max_upload_bytes + 64 * 1024,
+        "/api/v1/upload-bulk": settings.max_bulk_upload_bytes,
+    },
+)
+
 
 # Exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(_request, exc):
     """Global exception handler."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "error": str(exc)},
     )
@@ -175,8 +239,8 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
 
-    host = os.getenv("FASTAPI_HOST", "localhost")
-    port = int(os.getenv("FASTAPI_PORT", "8000"))
+    host = settings.fastapi_host
+    port = settings.fastapi_port
 
     logger.info(f"Starting server on {host}:{port}")
 
@@ -184,6 +248,9 @@ if __name__ == "__main__":
         "backend.main:app",
         host=host,
         port=port,
+        # uvloop isn't available on Windows; httptools is
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         reload=True,
-        log_level=os.getenv("LOG_LEVEL", "info").lower(),
+        log_level=settings.log_level.lower(),
     )
@@ -1,10 +1,12 @@
 """MCP server configuration loader."""
 
-import json
 import os
+import re
+from functools import cached_property
 from pathlib import Path
-from string import Template
+from typing import Literal
 
+import orjson
 from pydantic import BaseModel, Field
 
 
@@ -15,6 +17,17 @@ class MCPServerConfig(BaseModel):
     args: list[str]
     enabled: bool = True
     env: dict[str, str] = Field(default_factory=dict)
+    # Microseconds to hold outgoing messages so bursts share one write (0 = next loop tick)
+    write_coalesce_us: int = Field(default=0, ge=0)
+    # Level for the server's stderr lines (rate-limited, see MCPServerManager._log_stderr)
+    stderr_log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "DEBUG"
+    # Longest tool description sent to the LLM (first paragraph, ~60 tokens); None keeps it all
+    description_max_chars: int | None = Field(default=240, gt=1)
+    # Seconds to wait for a tool call response, with optional per-tool overrides
+    tool_timeout_s: float = Field(default=25.0, gt=0)
+    per_tool_timeout_s: dict[str, float] = Field(default_factory=dict)
+    # Most tool calls in flight on this server at once; None leaves it uncapped
+    max_in_flight: int | None = Field(default=None, ge=1)
 
 
 class MCPConfig(BaseModel):
@@ -22,11 +35,54 @@ class MCPConfig(BaseModel):
 
     mcpServers: dict[str, MCPServerConfig]
 
+    @cached_property
+    def enabled_servers(self) -> dict[str, MCPServerConfig]:
+        """Enabled servers by name, computed once per configuration."""
+        return {
+            name: server_config
+            for name, server_config in self.mcpServers.items()
+            if server_config.enabled
+        }
+
+
+# $$, ${VAR} and $VAR placeholders, as understood by string.Template
+_VAR_RE = re.compile(r"\$(?:(\$)|\{([A-Za-z_][A-Za-z0-9_]*)\}|([A-Za-z_][A-Za-z0-9_]*))")
+
+# Parsed configurations keyed by (resolved path, mtime_ns, size)
+_CONFIG_CACHE: dict[tuple[str, int, int], MCPConfig] = {}
+
+
+def _substitute_env(value: str) -> str:
+    """
+    Substitute environment variables in a string.
+
+    Behaves like ``string.Template.safe_substitute(os.environ)``: unknown
+    variables are left as-is and ``$$`` becomes ``$``.
+
+    Args:
+        value: String possibly containing ``$VAR`` or ``${VAR}`` placeholders
+
+    Returns:
+        String with known variables replaced
+    """
+    if "$" not in value:
+        return value
+
+    def replace(match: re.Match[str]) -> str:
+        if match.group(1):
+            return "$"
+        return os.environ.get(match.group(2) or match.group(3), match.group(0))
+
+    return _VAR_RE.sub(replace, value)
+
 
 def load_mcp_config(config_path: str | Path = "config/mcp_servers.json") -> MCPConfig:
     """
     Load MCP server configuration from JSON file.
 
+    The parsed configuration is cached until the file is modified, so
+    repeated loads skip parsing and environment variable substitution.
+
     Args:
         config_path: Path to the MCP configuration JSON file
 
@@ -35,24 +91,35 @@ def load_mcp_config(config_path: str | Path = "config/mcp_servers.json") -> MCPC
 
     Raises:
         FileNotFoundError: If config file doesn't exist
-        json.JSONDecodeError: If JSON is malformed
+        orjson.JSONDecodeError: If JSON is malformed
     """
     config_path = Path(config_path)
 
-    if not config_path.exists():
-        raise FileNotFoundError(f"MCP configuration file not found: {config_path}")
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"MCP configuration file not found: {config_path}") from None
+
+    cache_key = (str(config_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
-    with open(config_path) as f:
-        config_data = json.load(f)
+    config_data = orjson.loads(config_path.read_bytes())
 
     # Substitute environment variables in args
     for server_name, server_config in config_data.get("mcpServers", {}).items():
         if "args" in server_config:
-            server_config["args"] = [
-                Template(arg).safe_substitute(os.environ) for arg in server_config["args"]
-            ]
+            server_config["args"] = [_substitute_env(arg) for arg in server_config["args"]]
+
+    config = MCPConfig(**config_data)
+
+    # Only the latest version of each file is worth keeping
+    for key in [key for key in _CONFIG_CACHE if key[0] == cache_key[0]]:
+        del _CONFIG_CACHE[key]
+    _CONFIG_CACHE[cache_key] = config
 
-    return MCPConfig(**config_data)
+    return config
 
 
 def get_enabled_servers(config: MCPConfig) -> dict[str, MCPServerConfig]:
@@ -65,8 +132,4 @@ def get_enabled_servers(config: MCPConfig) -> dict[str, MCPServerConfig]:
     Returns:
         Dictionary of enabled server names to their configurations
     """
-    return {
-        name: server_config
-        for name, server_config in config.mcpServers.items()
-        if server_config.enabled
-    }
+    return config.enabled_servers
@@ -1,11 +1,18 @@
 """MCP server connection manager for remote MCP servers."""
 
 import asyncio
-import json
+import functools
+import hashlib
+import itertools
 import logging
 import os
-from typing import Any, Type
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
 
+import orjson
 from langchain_core.tools import BaseTool, StructuredTool
 from pydantic import BaseModel, create_model
 
@@ -13,6 +20,377 @@ from backend.mcp.config import MCPConfig, MCPServerConfig, get_enabled_servers
 
 logger = logging.getLogger(__name__)
 
+# Longest JSON-RPC line read from a server (asyncio's default is 64 KiB); tool
+# results can embed whole documents
+_STDOUT_LIMIT = 16 * 1024 * 1024
+
+# Queued bytes at which a server's write buffer is flushed without waiting
+_FLUSH_BYTES = 16 * 1024
+
+# stderr lines logged per second per server; the rest are summarized
+_STDERR_RATE = 10.0
+_STDERR_SUMMARY_INTERVAL = 5.0
+
+# Seconds a call to a tool served from the tool cache waits for its server to connect
+_READY_TIMEOUT = 60.0
+
+# JSON-RPC request ids; shared by all servers so pooled connections never see duplicates
+_REQUEST_IDS = itertools.count(1)
+
+
+def _request_head(method: str, params: dict[str, Any]) -> bytes:
+    """
+    Encode a JSON-RPC request up to, but not including, its id.
+
+    Args:
+        method: JSON-RPC method name
+        params: Method parameters
+
+    Returns:
+        The request object without its closing brace
+    """
+    request = {"jsonrpc": "2.0", "method": method, "params": params}
+    return orjson.dumps(request)[:-1]
+
+
+@functools.cache
+def _tool_call_prefix(tool_name: str) -> bytes:
+    """Encode the fixed part of a ``tools/call`` request, up to its arguments."""
+    name = orjson.dumps(tool_name)
+    return b'{"jsonrpc":"2.0","method":"tools/call","params":{"name":' + name + b',"arguments":'
+
+
+# The handshake is identical for every server, so it is encoded once
+_INITIALIZE_HEAD = _request_head(
+    "initialize",
+    {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {
+            "name": "cursor-streamlit-mcp",
+            "version": "0.1.0",
+        },
+    },
+)
+_INITIALIZED_FRAME = b'{"jsonrpc":"2.0","method":"notifications/initialized"}\n'
+_TOOLS_LIST_HEAD = _request_head("tools/list", {})
+
+
+# Python types for JSON schema property types
+_JSON_TYPES: dict[str, type] = {
+    "string": str,
+    "number": float,
+    "integer": int,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _build_args_model(tool_name: str, schema_key: bytes) -> type[BaseModel]:
+    """
+    Build the Pydantic args model for a tool's input schema.
+
+    Args:
+        tool_name: Name of the tool (for model naming)
+        schema_key: Input schema encoded with sorted keys, so equal schemas
+            share a cache entry
+
+    Returns:
+        Pydantic model class
+    """
+    json_schema = orjson.loads(schema_key)
+    properties = json_schema.get("properties", {})
+    required = json_schema.get("required", [])
+
+    # Build field definitions for Pydantic
+    field_definitions = {}
+    for prop_name, prop_schema in properties.items():
+        prop_type = _JSON_TYPES.get(prop_schema.get("type", "string"), str)
+
+        # Check if field is required
+        if prop_name in required:
+            # Required field
+            default = ...  # Ellipsis means required in Pydantic
+        else:
+            # Optional field with None default
+            default = None
+            prop_type = prop_type | None  # type: ignore[assignment]
+
+        field_definitions[prop_name] = (prop_type, default)
+
+    # Create the model
+    model_name = f"{tool_name.replace('-', '_').title()}Args"
+    return create_model(model_name, **field_definitions)  # type: ignore[call-overload]
+
+
+def _summarize_description(description: str, max_chars: int | None) -> str:
+    """
+    Shorten a tool description to the summary sent to the LLM with every call.
+
+    Args:
+        description: Full tool description from the MCP server
+        max_chars: Maximum summary length, or None to keep the description
+
+    Returns:
+        The first paragraph, whitespace-collapsed and cut at a word boundary
+    """
+    if max_chars is None:
+        return description
+
+    summary = " ".join(description.strip().split("\n\n", 1)[0].split())
+    if len(summary) <= max_chars:
+        return summary
+
+    cut = summary.rfind(" ", 0, max_chars - 1)
+    return summary[: cut if cut > 0 else max_chars - 1].rstrip(" ,;:") + "…"
+
+
+def _content_text(content: list[Any]) -> str:
+    """
+    Join the items of an MCP tool result's ``content`` list into text.
+
+    Text items contribute their text; other items (image, resource, etc.)
+    are included with their type so the model knows they were returned.
+
+    Args:
+        content: Content items from a ``tools/call`` result
+
+    Returns:
+        Newline-separated text
+    """
+    parts: list[str] = []
+    append = parts.append
+    for item in content:
+        # orjson decodes JSON objects to plain dicts, so an exact type check suffices
+        if type(item) is not dict:
+            append(str(item))
+            continue
+        kind = item.get("type")
+        if kind == "text":
+            append(item.get("text", ""))
+        else:
+            append(f"[{kind if 'type' in item else 'unknown'}]: {item}")
+    return "\n".join(parts)
+
+
+class _WriteBuffer:
+    """
+    JSON-RPC frames queued for one MCP server process, flushed as a single write.
+
+    The buffer belongs to the pooled server rather than to a manager, so
+    frames queued by any manager sharing the process are written even after
+    the manager that scheduled the flush has shut down.
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        process: asyncio.subprocess.Process,
+        pending: dict[int, asyncio.Future],
+        delay: float,
+    ) -> None:
+        """
+        Initialize the buffer.
+
+        Args:
+            server_name: Name of the MCP server (for logging)
+            process: The MCP server process
+            pending: The server's in-flight requests, failed if a write fails
+            delay: Seconds to wait for more frames before flushing; 0 flushes
+                on the next event-loop tick
+        """
+        self.server_name = server_name
+        self.process = process
+        self.pending = pending
+        self.delay = delay
+        self.frames: list[bytes] = []
+        self.ids: list[int | None] = []
+        self.size = 0
+        self.handle: asyncio.Handle | None = None
+        self._writes: set[asyncio.Task] = set()
+
+    def enqueue(self, frame: bytes, request_id: int | None) -> None:
+        """
+        Queue a message and schedule a flush.
+
+        The buffer is flushed after the server's ``write_coalesce_us`` window
+        (next loop tick by default), or immediately once it reaches 16 KB.
+
+        Args:
+            frame: Encoded JSON-RPC message, newline-terminated
+            request_id: Id of the request, or None for notifications
+        """
+        self.frames.append(frame)
+        self.ids.append(request_id)
+        self.size += len(frame)
+
+        if self.size >= _FLUSH_BYTES:
+            self.flush()
+        elif self.handle is None:
+            loop = asyncio.get_running_loop()
+            if self.delay:
+                self.handle = loop.call_later(self.delay, self.flush)
+            else:
+                self.handle = loop.call_soon(self.flush)
+
+    def flush(self) -> None:
+        """Write every queued message in one coalesced write."""
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        if not self.frames:
+            return
+
+        payload, ids = b"".join(self.frames), self.ids
+        self.frames, self.ids, self.size = [], [], 0
+
+        task = asyncio.create_task(self._write(payload, ids))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    def close(self) -> None:
+        """Cancel the scheduled flush and drop queued messages."""
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        self.frames, self.ids, self.size = [], [], 0
+
+    async def _write(self, payload: bytes, ids: list[int | None]) -> None:
+        """
+        Send buffered frames, failing their pending requests on error.
+
+        Args:
+            payload: Newline-delimited JSON-RPC frames
+            ids: Request ids contained in the payload (None for notifications)
+        """
+        try:
+            await self._send(payload)
+        except Exception as e:
+            logger.error("Error writing to MCP server '%s': %s", self.server_name, e)
+            for request_id in ids:
+                future = self.pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+
+    async def _send(self, payload: bytes) -> None:
+        """Send newline-delimited JSON-RPC frames to the MCP server."""
+        stdin = self.process.stdin
+        if not stdin:
+            raise RuntimeError("Process stdin not available")
+        if stdin.is_closing():
+            raise RuntimeError("Process stdin is closed")
+
+        stdin.write(payload)
+
+        # drain() only matters for backpressure, so skip the extra await while
+        # the transport buffer is well below its high-water mark
+        transport = stdin.transport
+        if transport.get_write_buffer_size() > transport.get_write_buffer_limits()[1] // 2:
+            await stdin.drain()
+        logger.debug("Sent %d byte(s)", len(payload))
+
+
+class _PooledServer:
+    """A running MCP server, shared by every manager launching the same command."""
+
+    def __init__(
+        self,
+        server_name: str,
+        process: asyncio.subprocess.Process,
+        server_config: MCPServerConfig,
+    ) -> None:
+        """
+        Initialize the pool entry.
+
+        Args:
+            server_name: Name of the MCP server that spawned the process
+            process: The MCP server process
+            server_config: Configuration the process was launched with
+        """
+        self.process = process
+        # In-flight requests keyed by JSON-RPC id
+        self.pending: dict[int, asyncio.Future] = {}
+        self.outbox = _WriteBuffer(
+            server_name, process, self.pending, server_config.write_coalesce_us / 1e6
+        )
+        # Shared by every manager using this process, so the cap is per server
+        max_in_flight = server_config.max_in_flight
+        self.slots = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self.reader: asyncio.Task | None = None
+        self.stderr_reader: asyncio.Task | None = None
+        self.mcp_tools: list[dict[str, Any]] = []
+
+    def close(self) -> None:
+        """Stop writing to and reading from the process before it is terminated."""
+        self.outbox.close()
+        if self.reader is not None:
+            self.reader.cancel()
+
+
+class _PoolEntry:
+    """A pooled server spawn and the number of managers holding a reference to it."""
+
+    def __init__(self, spawn: asyncio.Task[_PooledServer]) -> None:
+        """
+        Initialize the entry.
+
+        Args:
+            spawn: Task spawning the server and performing its handshake
+        """
+        self.spawn = spawn
+        self.refcount = 0
+
+
+_PoolKey = tuple[
+    asyncio.AbstractEventLoop,
+    str,
+    tuple[str, ...],
+    frozenset[tuple[str, str]],
+    int,
+    str,
+    int | None,
+]
+
+# Server processes shared across manager instances, keyed by loop, launch
+# command and the settings baked into the pooled server
+_PROCESS_POOL: dict[_PoolKey, _PoolEntry] = {}
+
+
+def _pool_key(server_config: MCPServerConfig) -> _PoolKey:
+    """
+    Build the process pool key for a server configuration.
+
+    Write coalescing, stderr level and the in-flight cap are fixed when the
+    process is spawned, so configurations differing in them get their own
+    process instead of silently inheriting another manager's settings.
+    """
+    return (
+        asyncio.get_running_loop(),
+        server_config.command,
+        tuple(server_config.args),
+        frozenset(server_config.env.items()),
+        server_config.write_coalesce_us,
+        server_config.stderr_log_level,
+        server_config.max_in_flight,
+    )
+
+
+def _config_fingerprint(server_config: MCPServerConfig) -> str:
+    """Hash the launch command of a server, so cached tools are dropped when it changes."""
+    launch = [server_config.command, server_config.args, sorted(server_config.env.items())]
+    return hashlib.blake2b(orjson.dumps(launch), digest_size=16).hexdigest()
+
+
+def _is_reusable(spawn: asyncio.Task[_PooledServer]) -> bool:
+    """Whether a pooled spawn is still starting or produced a live server."""
+    if not spawn.done():
+        return True
+    if spawn.cancelled() or spawn.exception() is not None:
+        return False
+    return spawn.result().process.returncode is None
+
 
 class MCPServerManager:
     """
@@ -25,19 +403,46 @@ class MCPServerManager:
     - Managing tool lifecycle
     """
 
-    def __init__(self, config: MCPConfig) -> None:
+    def __init__(self, config: MCPConfig, tool_cache_path: str | Path | None = None) -> None:
         """
         Initialize MCP server manager.
 
         Args:
             config: MCP configuration object
+            tool_cache_path: JSON file caching each server's tool list between
+                runs, or None to always wait for the handshake
         """
         self.config = config
         self.enabled_servers = get_enabled_servers(config)
         self.tools: dict[str, list[BaseTool]] = {}
         self.processes: dict[str, asyncio.subprocess.Process] = {}
+        # Full tool descriptions and input schemas by tool name; the LangChain
+        # tools only carry a short summary so tool definitions stay small
+        self.tool_descriptions: dict[str, str] = {}
+        self.tool_schemas: dict[str, dict[str, Any]] = {}
+        # Pool entries this manager holds a reference to
+        self._servers: dict[str, tuple[_PoolKey, _PoolEntry]] = {}
+        # MCP tool definitions the LangChain tools were built from, per server
+        self._tool_defs: dict[str, list[dict[str, Any]]] = {}
+        # Bumped whenever a server's tool list changes
+        self.tools_generation = 0
+        self._tools_listeners: list[Callable[[], None]] = []
+        # In-flight requests per server, keyed by JSON-RPC id
+        self._pending: dict[str, dict[int, asyncio.Future]] = {}
+        # Frames queued for the next coalesced write, per server
+        self._outbox: dict[str, _WriteBuffer] = {}
+        # Caps on concurrent tool calls, for servers configured with one
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        # Tool lists from earlier runs; servers served from it connect in the background
+        self._tool_cache_path = Path(tool_cache_path) if tool_cache_path else None
+        self._tool_cache: dict[str, dict[str, Any]] = {}
+        self._tool_cache_dirty = False
+        self._ready: dict[str, asyncio.Event] = {}
+        self._background: set[asyncio.Task] = set()
         self._initialized = False
         self._loop: asyncio.AbstractEventLoop | None = None
+        # Parent environment, copied once and merged with each server's overrides
+        self._base_env = dict(os.environ)
 
     async def initialize(self) -> None:
         """
@@ -50,205 +455,493 @@ class MCPServerManager:
             return
 
         logger.info("Initializing MCP server connections...")
-        
+
         # Store the event loop that creates the subprocesses
         self._loop = asyncio.get_running_loop()
 
+        # Servers whose tools were cached by an earlier run are usable right
+        # away; their handshake finishes in the background
+        self._tool_cache = self._load_tool_cache()
+        connects = []
         for server_name, server_config in self.enabled_servers.items():
-            try:
-                await self._connect_server(server_name, server_config)
-            except Exception as e:
-                logger.error(f"Failed to connect to MCP server '{server_name}': {e}")
+            cached_tools = self._cached_tools(server_name, server_config)
+            if cached_tools is None:
+                connects.append(self._safe_connect(server_name, server_config))
+                continue
+
+            self._ready[server_name] = asyncio.Event()
+            self._tool_defs[server_name] = cached_tools
+            self.tools[server_name] = [
+                self._convert_mcp_tool(server_name, mcp_tool) for mcp_tool in cached_tools
+            ]
+            logger.info(
+                "Loaded %d cached tool(s) for MCP server '%s'", len(cached_tools), server_name
+            )
+            task = asyncio.create_task(self._connect_deferred(server_name, server_config))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        # Spawn and handshake with the remaining servers concurrently
+        await asyncio.gather(*connects)
+        self._save_tool_cache()
 
         self._initialized = True
         logger.info(
-            f"MCP server initialization complete. Connected to {len(self.tools)} server(s)."
+            "MCP server initialization complete. Connected to %d server(s).", len(self.tools)
         )
 
-    async def _connect_server(self, server_name: str, server_config: MCPServerConfig) -> None:
+    async def _safe_connect(self, server_name: str, server_config: MCPServerConfig) -> None:
         """
-        Connect to a specific MCP server by spawning its process.
+        Connect to an MCP server, logging instead of raising on failure.
+
+        The server's tool cache entry is refreshed on success and dropped on
+        failure.
 
         Args:
             server_name: Name of the MCP server
             server_config: Configuration for the server
         """
-        logger.info(f"Connecting to MCP server: {server_name}")
-        logger.debug(f"Command: {server_config.command} {' '.join(server_config.args)}")
+        try:
+            await self._connect_server(server_name, server_config)
+        except Exception as e:
+            logger.error("Failed to connect to MCP server '%s': %s", server_name, e)
+            if self._tool_cache.pop(server_name, None) is not None:
+                self._tool_cache_dirty = True
+            return
+
+        mcp_tools = self._servers[server_name][1].spawn.result().mcp_tools
+        entry = {"fingerprint": _config_fingerprint(server_config), "tools": mcp_tools}
+        if not mcp_tools:
+            # Failed handshakes list no tools; don't serve that on the next start
+            self._tool_cache_dirty |= self._tool_cache.pop(server_name, None) is not None
+        elif self._tool_cache.get(server_name) != entry:
+            self._tool_cache[server_name] = entry
+            self._tool_cache_dirty = True
 
+    async def _connect_deferred(self, server_name: str, server_config: MCPServerConfig) -> None:
+        """
+        Connect to a server whose tools were served from the cache.
+
+        Args:
+            server_name: Name of the MCP server
+            server_config: Configuration for the server
+        """
         try:
-            # Spawn the MCP server process
-            process = await asyncio.create_subprocess_exec(
-                server_config.command,
-                *server_config.args,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env={**os.environ, **server_config.env} if server_config.env else None,
-            )
+            await self._safe_connect(server_name, server_config)
+        finally:
+            # Release waiting tool calls; they fail cleanly if the connect did
+            self._ready[server_name].set()
+        self._save_tool_cache()
+
+    def _cached_tools(
+        self, server_name: str, server_config: MCPServerConfig
+    ) -> list[dict[str, Any]] | None:
+        """
+        Get a server's cached tool definitions if they match its launch command.
 
-            self.processes[server_name] = process
-            
-            # Start stderr reader task
-            asyncio.create_task(self._log_stderr(server_name, process))
+        Args:
+            server_name: Name of the MCP server
+            server_config: Configuration for the server
 
-            # Initialize MCP connection and list tools
-            tools = await self._initialize_mcp_connection(server_name, process)
-            self.tools[server_name] = tools
+        Returns:
+            MCP tool definitions, or None if there is no usable cache entry
+        """
+        entry = self._tool_cache.get(server_name)
+        if not isinstance(entry, dict) or not entry.get("tools"):
+            return None
+        if entry.get("fingerprint") != _config_fingerprint(server_config):
+            return None
+        return entry["tools"]
+
+    def _load_tool_cache(self) -> dict[str, dict[str, Any]]:
+        """
+        Read the tool cache file.
 
-            logger.info(f"Loaded {len(tools)} tool(s) from MCP server '{server_name}'")
+        Returns:
+            Cache entries by server name; empty if caching is off or the file
+            is missing or unreadable
+        """
+        if self._tool_cache_path is None or not self._tool_cache_path.exists():
+            return {}
+        try:
+            data = orjson.loads(self._tool_cache_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable MCP tool cache %s: %s", self._tool_cache_path, e)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_tool_cache(self) -> None:
+        """Write the tool cache file if any entry changed."""
+        if self._tool_cache_path is None or not self._tool_cache_dirty:
+            return
 
+        entries = {
+            name: entry for name, entry in self._tool_cache.items() if name in self.enabled_servers
+        }
+        tmp_path = self._tool_cache_path.with_suffix(".tmp")
+        try:
+            self._tool_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(orjson.dumps(entries))
+            os.replace(tmp_path, self._tool_cache_path)
+            self._tool_cache_dirty = False
+        except OSError as e:
+            logger.warning("Could not write MCP tool cache %s: %s", self._tool_cache_path, e)
+
+    async def _connect_server(self, server_name: str, server_config: MCPServerConfig) -> None:
+        """
+        Connect to a specific MCP server, reusing a pooled process if one exists.
+
+        Managers launching the same command on the same event loop share one
+        process; it is terminated when the last of them shuts down.
+
+        Args:
+            server_name: Name of the MCP server
+            server_config: Configuration for the server
+        """
+        logger.info("Connecting to MCP server: %s", server_name)
+
+        key = _pool_key(server_config)
+        entry = _PROCESS_POOL.get(key)
+        if entry is None or not _is_reusable(entry.spawn):
+            entry = _PoolEntry(
+                asyncio.ensure_future(self._spawn_server(server_name, server_config))
+            )
+            _PROCESS_POOL[key] = entry
+
+        # Hold the reference before waiting, so shutdown() also releases
+        # (and, if last, stops) a spawn that is still starting
+        entry.refcount += 1
+        self._servers[server_name] = (key, entry)
+
+        try:
+            # Shielded so a cancelled caller doesn't abort a spawn others may share
+            server = await asyncio.shield(entry.spawn)
         except Exception as e:
-            logger.error(f"Error connecting to {server_name}: {e}", exc_info=True)
+            self._release(server_name)
+            if _PROCESS_POOL.get(key) is entry:
+                del _PROCESS_POOL[key]
+            logger.error("Error connecting to %s: %s", server_name, e, exc_info=True)
             raise
-    
-    async def _log_stderr(self, server_name: str, process: asyncio.subprocess.Process) -> None:
-        """Log stderr output from MCP server process."""
-        if process.stderr:
-            while True:
-                line = await process.stderr.readline()
-                if not line:
-                    break
-                logger.warning(f"[{server_name} stderr] {line.decode().strip()}")
 
-    async def _initialize_mcp_connection(
-        self, server_name: str, process: asyncio.subprocess.Process
-    ) -> list[BaseTool]:
+        if entry.refcount > 1:
+            logger.debug("[pool] reused key=%s, refcount=%d", key[1:], entry.refcount)
+
+        self.processes[server_name] = server.process
+        self._pending[server_name] = server.pending
+        self._outbox[server_name] = server.outbox
+        if server.slots is not None:
+            self._slots[server_name] = server.slots
+
+        # Tools built from the tool cache stay in place if the server still
+        # lists the same ones
+        if server_name not in self.tools or self._tool_defs.get(server_name) != server.mcp_tools:
+            for tool in self.tools.get(server_name, []):
+                self.tool_descriptions.pop(tool.name, None)
+                self.tool_schemas.pop(tool.name, None)
+            self._tool_defs[server_name] = server.mcp_tools
+            self.tools[server_name] = [
+                self._convert_mcp_tool(server_name, mcp_tool) for mcp_tool in server.mcp_tools
+            ]
+            self._tools_changed()
+
+        logger.info(
+            "Loaded %d tool(s) from MCP server '%s'", len(self.tools[server_name]), server_name
+        )
+
+    def _release(self, server_name: str) -> _PoolEntry | None:
+        """
+        Drop this manager's reference to a server's pool entry.
+
+        Args:
+            server_name: Name of the MCP server
+
+        Returns:
+            The entry if this was its last reference, so the caller retires it
+        """
+        key, entry = self._servers.pop(server_name)
+        entry.refcount -= 1
+        if entry.refcount > 0:
+            logger.debug("[pool] released %s, refcount=%d", server_name, entry.refcount)
+            return None
+
+        if _PROCESS_POOL.get(key) is entry:
+            del _PROCESS_POOL[key]
+        return entry
+
+    def _tools_changed(self) -> None:
+        """Record a change to the tool list and notify listeners after startup."""
+        self.tools_generation += 1
+        if not self._initialized:
+            # initialize() callers read the tools once it returns
+            return
+
+        for listener in self._tools_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error("MCP tools listener failed: %s", e, exc_info=True)
+
+    def add_tools_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callback run when a server's tools change after initialization.
+
+        Servers served from the tool cache finish connecting in the background;
+        if they then list different tools, consumers holding the earlier tools
+        (e.g. a built agent) need to pick up the new ones.
+
+        Args:
+            listener: Callback taking no arguments; read the tools from the manager
+        """
+        self._tools_listeners.append(listener)
+
+    async def _spawn_server(
+        self, server_name: str, server_config: MCPServerConfig
+    ) -> _PooledServer:
+        """
+        Spawn an MCP server process and perform the MCP handshake.
+
+        Args:
+            server_name: Name of the MCP server
+            server_config: Configuration for the server
+
+        Returns:
+            Pool entry for the running server
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Command: %s %s", server_config.command, " ".join(server_config.args))
+
+        # Spawn the MCP server process
+        process = await asyncio.create_subprocess_exec(
+            server_config.command,
+            *server_config.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_STDOUT_LIMIT,
+            env=self._base_env | server_config.env if server_config.env else None,
+        )
+
+        server = _PooledServer(server_name, process, server_config)
+        self._pending[server_name] = server.pending
+        self._outbox[server_name] = server.outbox
+
+        # Start stderr reader and stdout response dispatcher tasks
+        stderr_level = logging.getLevelNamesMapping()[server_config.stderr_log_level]
+        server.stderr_reader = asyncio.create_task(
+            self._log_stderr(server_name, process, stderr_level)
+        )
+        server.reader = asyncio.create_task(self._reader_loop(server_name, process))
+
+        # Initialize MCP connection and list tools
+        try:
+            server.mcp_tools = await self._initialize_mcp_connection(server_name)
+        except asyncio.CancelledError:
+            # Nobody will receive this server, so don't leave the process behind
+            server.close()
+            await self._terminate(server_name, process)
+            raise
+        return server
+
+    async def _log_stderr(
+        self, server_name: str, process: asyncio.subprocess.Process, level: int
+    ) -> None:
+        """
+        Drain stderr output from the MCP server process, logging it rate-limited.
+
+        Up to ``_STDERR_RATE`` lines per second are logged; lines over budget
+        go to a ring buffer and are summarized every few seconds, so a chatty
+        server cannot flood the log from the event loop.
+
+        Args:
+            server_name: Name of the MCP server
+            process: The MCP server process
+            level: Logging level for stderr lines
+        """
+        if not process.stderr:
+            return
+
+        dropped: deque[bytes] = deque(maxlen=200)
+        dropped_count = 0
+        tokens = _STDERR_RATE
+        last_refill = last_summary = time.monotonic()
+
+        def summarize() -> None:
+            tail = dropped[-1].decode(errors="replace").rstrip() if dropped else ""
+            logger.log(
+                level,
+                "[%s stderr] %d line(s) dropped; last: %s",
+                server_name,
+                dropped_count,
+                tail,
+            )
+
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                break
+            if not logger.isEnabledFor(level):
+                continue
+
+            now = time.monotonic()
+            tokens = min(_STDERR_RATE, tokens + (now - last_refill) * _STDERR_RATE)
+            last_refill = now
+
+            if tokens >= 1:
+                tokens -= 1
+                logger.log(
+                    level, "[%s stderr] %s", server_name, line.decode(errors="replace").rstrip()
+                )
+            else:
+                dropped.append(line)
+                dropped_count += 1
+
+            if dropped_count and now - last_summary >= _STDERR_SUMMARY_INTERVAL:
+                summarize()
+                dropped.clear()
+                dropped_count = 0
+                last_summary = now
+
+        if dropped_count:
+            summarize()
+
+    async def _initialize_mcp_connection(self, server_name: str) -> list[dict[str, Any]]:
         """
         Initialize MCP connection and retrieve available tools.
 
         Args:
             server_name: Name of the server
-            process: The subprocess running the MCP server
 
         Returns:
-            List of LangChain tools
+            MCP tool definitions
         """
-        tools: list[BaseTool] = []
+        tools: list[dict[str, Any]] = []
+        pending = self._pending[server_name]
+        list_id: int | None = None
 
         try:
-            logger.info(f"Sending initialize request to {server_name}...")
-            
-            # Send initialize request
-            init_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {
-                        "name": "cursor-streamlit-mcp",
-                        "version": "0.1.0",
-                    },
-                },
-            }
-
-            await self._send_jsonrpc(process, init_request)
-            init_response = await asyncio.wait_for(
-                self._read_jsonrpc(process), timeout=10.0
-            )
-            
-            logger.debug(f"Init response from {server_name}: {init_response}")
+            logger.info("Sending initialize request to %s...", server_name)
+
+            # Pipeline initialize, initialized and tools/list into one write so
+            # the tools list doesn't wait for a second round trip
+            init_id, init_future = self._start_request(server_name, _INITIALIZE_HEAD)
+            self._notify(server_name, _INITIALIZED_FRAME)
+            list_id, list_future = self._start_request(server_name, _TOOLS_LIST_HEAD)
+
+            init_response = await self._response(pending, init_id, init_future, timeout=10.0)
+
+            logger.debug("Init response from %s: %s", server_name, init_response)
 
             if "error" in init_response:
                 logger.error(
-                    f"MCP initialization error for {server_name}: {init_response['error']}"
+                    "MCP initialization error for %s: %s", server_name, init_response["error"]
                 )
                 return tools
 
-            # Send initialized notification
-            initialized_notification = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized",
-            }
-            await self._send_jsonrpc(process, initialized_notification)
-
-            logger.info(f"Requesting tools list from {server_name}...")
-            
-            # List available tools
-            list_tools_request = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list",
-                "params": {},
-            }
-
-            await self._send_jsonrpc(process, list_tools_request)
-            tools_response = await asyncio.wait_for(
-                self._read_jsonrpc(process), timeout=10.0
-            )
-            
-            logger.debug(f"Tools response from {server_name}: {tools_response}")
+            logger.info("Requesting tools list from %s...", server_name)
+
+            tools_response = await self._response(pending, list_id, list_future, timeout=10.0)
 
             if "error" in tools_response:
-                logger.error(f"Error listing tools for {server_name}: {tools_response['error']}")
+                # Servers that refuse requests before initialization completes
+                # get a second, unpipelined tools/list
+                logger.debug("Pipelined tools/list rejected by %s, retrying", server_name)
+                tools_response = await self._request(server_name, _TOOLS_LIST_HEAD, timeout=10.0)
+
+            logger.debug("Tools response from %s: %s", server_name, tools_response)
+
+            if "error" in tools_response:
+                logger.error("Error listing tools for %s: %s", server_name, tools_response["error"])
                 return tools
 
-            # Convert MCP tools to LangChain tools
-            mcp_tools = tools_response.get("result", {}).get("tools", [])
-            for mcp_tool in mcp_tools:
-                langchain_tool = self._convert_mcp_tool(server_name, mcp_tool, process)
-                tools.append(langchain_tool)
+            tools = tools_response.get("result", {}).get("tools", [])
 
         except Exception as e:
-            logger.error(f"Error initializing MCP connection for {server_name}: {e}")
+            logger.error("Error initializing MCP connection for %s: %s", server_name, e)
+        finally:
+            if list_id is not None:
+                pending.pop(list_id, None)
 
         return tools
 
-    def _convert_mcp_tool(
-        self, server_name: str, mcp_tool: dict[str, Any], process: asyncio.subprocess.Process
-    ) -> BaseTool:
+    def _convert_mcp_tool(self, server_name: str, mcp_tool: dict[str, Any]) -> BaseTool:
         """
         Convert an MCP tool definition to a LangChain tool.
 
+        The tool looks up the server's process when called, so tools built
+        from the tool cache work once the server has connected.
+
         Args:
             server_name: Name of the MCP server
             mcp_tool: MCP tool definition
-            process: The MCP server process
 
         Returns:
             LangChain StructuredTool
         """
         tool_name = mcp_tool["name"]
+        full_name = f"{server_name}_{tool_name}"
         tool_description = mcp_tool.get("description", f"Tool: {tool_name}")
         input_schema = mcp_tool.get("inputSchema", {})
-        
-        logger.debug(f"Converting tool {tool_name} with schema: {input_schema}")
+
+        self.tool_descriptions[full_name] = tool_description
+        self.tool_schemas[full_name] = input_schema
+        server_config = self.enabled_servers[server_name]
+        max_chars = server_config.description_max_chars
+        timeout = server_config.per_tool_timeout_s.get(tool_name, server_config.tool_timeout_s)
+
+        logger.debug("Converting tool %s with schema: %s", tool_name, input_schema)
+
+        async def tool_coro(**kwargs: Any) -> str:
+            """Execute the MCP tool on the manager's event loop."""
+            logger.info("Executing MCP tool: %s", full_name)
+            logger.debug("Tool arguments: %s", kwargs)
+
+            call = self._execute_mcp_tool(server_name, tool_name, kwargs, timeout)
+            if asyncio.get_running_loop() is self._loop:
+                return await call
+            # Called from another loop: the server's pipes belong to the manager's loop
+            if not self._loop:
+                call.close()
+                raise RuntimeError("MCP manager not properly initialized - no event loop stored")
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(call, self._loop))
 
         def tool_func(**kwargs: Any) -> str:
-            """Execute the MCP tool."""
-            logger.info(f"🔧 Executing MCP tool: {server_name}_{tool_name}")
-            logger.debug(f"Tool arguments: {kwargs}")
-            
+            """Execute the MCP tool from synchronous callers."""
+            logger.info("Executing MCP tool: %s", full_name)
+            logger.debug("Tool arguments: %s", kwargs)
+
             try:
                 # Use the manager's event loop to execute the async call
                 # This ensures we use the same loop where the subprocess was created
-                result = self._execute_tool_sync(server_name, tool_name, kwargs, process)
-                logger.info(f"✅ MCP tool {server_name}_{tool_name} completed successfully")
+                result = self._execute_tool_sync(server_name, tool_name, kwargs, timeout)
+                logger.info("MCP tool %s completed successfully", full_name)
                 return result
 
             except Exception as e:
-                error_msg = f"❌ Error executing {tool_name}: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                return error_msg
+                logger.error("Error executing %s: %s", tool_name, e, exc_info=True)
+                return f"Error executing {tool_name}: {e}"
 
         # Convert JSON schema to Pydantic model if available
         args_model = None
         if input_schema and "properties" in input_schema:
             args_model = self._create_pydantic_model(tool_name, input_schema)
-        
+
         return StructuredTool.from_function(
             func=tool_func,  # Synchronous wrapper
-            name=f"{server_name}_{tool_name}",
-            description=tool_description,
+            coroutine=tool_coro,  # Awaited directly by ainvoke
+            name=full_name,
+            description=_summarize_description(tool_description, max_chars),
             args_schema=args_model,  # Pydantic model for arguments
         )
 
-    def _create_pydantic_model(self, tool_name: str, json_schema: dict[str, Any]) -> Type[BaseModel]:
+    def _create_pydantic_model(
+        self, tool_name: str, json_schema: dict[str, Any]
+    ) -> type[BaseModel]:
         """
         Create a Pydantic model from a JSON schema.
 
+        Models are cached by tool name and schema content, so re-initializing
+        managers or reconnecting to a server reuses the classes built before.
+
         Args:
             tool_name: Name of the tool (for model naming)
             json_schema: JSON schema definition
@@ -256,57 +949,15 @@ class MCPServerManager:
         Returns:
             Pydantic model class
         """
-        properties = json_schema.get("properties", {})
-        required = json_schema.get("required", [])
-        
-        # Build field definitions for Pydantic
-        field_definitions = {}
-        for prop_name, prop_schema in properties.items():
-            prop_type = self._json_type_to_python(prop_schema)
-            
-            # Check if field is required
-            if prop_name in required:
-                # Required field
-                default = ...  # Ellipsis means required in Pydantic
-            else:
-                # Optional field with None default
-                default = None
-                prop_type = prop_type | None  # type: ignore[assignment]
-            
-            # Add description if available
-            description = prop_schema.get("description", "")
-            
-            field_definitions[prop_name] = (prop_type, default)
-        
-        # Create the model
-        model_name = f"{tool_name.replace('-', '_').title()}Args"
-        return create_model(model_name, **field_definitions)  # type: ignore[call-overload]
-    
-    def _json_type_to_python(self, schema: dict[str, Any]) -> type:
-        """
-        Convert JSON schema type to Python type.
-
-        Args:
-            schema: JSON schema for a property
-
-        Returns:
-            Python type
-        """
-        json_type = schema.get("type", "string")
-        
-        type_mapping = {
-            "string": str,
-            "number": float,
-            "integer": int,
-            "boolean": bool,
-            "array": list,
-            "object": dict,
-        }
-        
-        return type_mapping.get(json_type, str)
+        schema_key = orjson.dumps(json_schema, option=orjson.OPT_SORT_KEYS)
+        return _build_args_model(tool_name, schema_key)
 
     def _execute_tool_sync(
-        self, server_name: str, tool_name: str, arguments: dict[str, Any], process: asyncio.subprocess.Process
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: dict[str, Any],
+        timeout: float = 25.0,
     ) -> str:
         """
         Execute MCP tool synchronously by scheduling on the correct event loop.
@@ -315,146 +966,260 @@ class MCPServerManager:
             server_name: Name of the MCP server
             tool_name: Name of the tool
             arguments: Tool arguments
-            process: MCP server process
+            timeout: Seconds to wait for the tool's response
 
         Returns:
             Tool result as string
         """
         if not self._loop:
             raise RuntimeError("MCP manager not properly initialized - no event loop stored")
-        
+
+        # Blocking on the manager's own loop thread would deadlock until the timeout
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            raise RuntimeError(
+                "Synchronous MCP tool call on the MCP manager's event loop; use ainvoke instead"
+            )
+        if not self._loop.is_running():
+            # Nothing would ever run the scheduled call; fail now rather than at the timeout
+            raise RuntimeError("MCP manager's event loop is not running")
+
         # Schedule the coroutine on the stored event loop
         future = asyncio.run_coroutine_threadsafe(
-            self._execute_mcp_tool(server_name, tool_name, arguments, process),
-            self._loop
+            self._execute_mcp_tool(server_name, tool_name, arguments, timeout), self._loop
         )
-        
-        # Wait for result with timeout
+
+        # Wait for result, allowing the call's own timeouts to fire first
+        ready = self._ready.get(server_name)
+        wait = timeout + 5 + (_READY_TIMEOUT if ready is not None and not ready.is_set() else 0)
         try:
-            result = future.result(timeout=30)
+            result = future.result(timeout=wait)
             return result
         except TimeoutError:
-            return f"⏱️ MCP tool call timed out after 30s"
+            return f"MCP tool call timed out after {wait:g}s"
         except Exception as e:
-            logger.error(f"Error in _execute_tool_sync: {e}", exc_info=True)
+            logger.error("Error in _execute_tool_sync: %s", e, exc_info=True)
             return f"Error: {str(e)}"
 
     async def _execute_mcp_tool(
-        self, server_name: str, tool_name: str, arguments: dict[str, Any], process: asyncio.subprocess.Process
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: dict[str, Any],
+        timeout: float = 25.0,
     ) -> str:
         """
         Execute an MCP tool call.
 
+        Tools served from the tool cache first wait for their server to finish
+        connecting.
+
         Args:
             server_name: Name of the MCP server
             tool_name: Name of the tool to call
             arguments: Tool arguments
-            process: MCP server process
+            timeout: Seconds to wait for the response
 
         Returns:
             Tool result as string
         """
-        request_id = f"{server_name}_{tool_name}_{id(arguments)}"
-        
+        ready = self._ready.get(server_name)
+        if ready is not None and not ready.is_set():
+            try:
+                await asyncio.wait_for(ready.wait(), timeout=_READY_TIMEOUT)
+            except TimeoutError:
+                return f"MCP server {server_name} is still starting, try again shortly"
+
+        if server_name not in self.processes:
+            return f"MCP server {server_name} is not connected"
+
         try:
-            # Send tool call request
-            call_request = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "method": "tools/call",
-                "params": {"name": tool_name, "arguments": arguments},
-            }
-
-            logger.info(f"📤 Sending MCP request to {server_name}: {tool_name}")
-            logger.debug(f"Request: {json.dumps(call_request, indent=2)}")
-            
-            await self._send_jsonrpc(process, call_request)
-            
-            # Read response with timeout
-            logger.debug(f"⏳ Waiting for response from {server_name}...")
-            response = await asyncio.wait_for(
-                self._read_jsonrpc(process),
-                timeout=25.0
-            )
-            
-            logger.info(f"📥 Received response from {server_name}")
-            logger.debug(f"Response: {json.dumps(response, indent=2)}")
+            # Send tool call request and wait for the response; only the
+            # arguments are encoded per call
+            encoded_arguments = orjson.dumps(arguments)
+            head = _tool_call_prefix(tool_name) + encoded_arguments + b"}"
+
+            logger.info("Sending MCP request to %s: %s", server_name, tool_name)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Request arguments: %s", encoded_arguments.decode())
+
+            slots = self._slots.get(server_name)
+            if slots is None:
+                response = await self._request(server_name, head, timeout=timeout)
+            else:
+                # Time spent queued for a slot counts towards the timeout
+                async with asyncio.timeout(timeout):
+                    async with slots:
+                        response = await self._request(server_name, head, timeout=timeout)
+
+            logger.info("Received response from %s", server_name)
+            logger.debug("Response: %s", response)
 
             # Check for JSON-RPC error
             if "error" in response:
                 error_detail = response["error"]
-                error_msg = f"MCP Error from {server_name}: {error_detail.get('message', error_detail)}"
+                error_msg = (
+                    f"MCP Error from {server_name}: {error_detail.get('message', error_detail)}"
+                )
                 logger.error(error_msg)
                 return error_msg
 
             # Extract result
             result = response.get("result", {})
-            
+
             # MCP tools return content in various formats
             # Try to extract the most useful representation
             if "content" in result:
                 content = result["content"]
-                
+
                 # Content is typically a list of content items
-                if isinstance(content, list) and len(content) > 0:
-                    # Each item can be text, image, resource, etc.
-                    text_parts = []
-                    for item in content:
-                        if isinstance(item, dict):
-                            if item.get("type") == "text":
-                                text_parts.append(item.get("text", ""))
-                            else:
-                                # For non-text content, include the type
-                                text_parts.append(f"[{item.get('type', 'unknown')}]: {item}")
-                        else:
-                            text_parts.append(str(item))
-                    
-                    if text_parts:
-                        return "\n".join(text_parts)
-                
+                if type(content) is list and content:
+                    return _content_text(content)
+
                 # Fallback: return content as string
                 return str(content)
-            
+
             # No content field, return the whole result
-            return json.dumps(result, indent=2)
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
 
-        except asyncio.TimeoutError:
-            error_msg = f"⏱️ MCP tool call timed out after 25s: {server_name}_{tool_name}"
+        except TimeoutError:
+            error_msg = f"MCP tool call timed out after {timeout:g}s: {server_name}_{tool_name}"
             logger.error(error_msg)
             return error_msg
         except Exception as e:
-            error_msg = f"❌ Error executing MCP tool {server_name}_{tool_name}: {str(e)}"
+            error_msg = f"Error executing MCP tool {server_name}_{tool_name}: {e}"
             logger.error(error_msg, exc_info=True)
             return error_msg
 
-    async def _send_jsonrpc(
-        self, process: asyncio.subprocess.Process, message: dict[str, Any]
-    ) -> None:
-        """Send a JSON-RPC message to the MCP server."""
-        if not process.stdin:
-            raise RuntimeError("Process stdin not available")
-        
-        message_str = json.dumps(message) + "\n"
-        process.stdin.write(message_str.encode())
-        await process.stdin.drain()
-        logger.debug(f"📤 Sent: {message.get('method', message.get('id'))}")
-
-    async def _read_jsonrpc(self, process: asyncio.subprocess.Process) -> dict[str, Any]:
-        """Read a JSON-RPC response from the MCP server."""
+    async def _request(self, server_name: str, head: bytes, timeout: float) -> dict[str, Any]:
+        """
+        Send a JSON-RPC request and wait for its response.
+
+        The response is delivered by the server's reader task, so several
+        requests to the same server can be in flight at once. Requests made
+        in the same event-loop tick are written to the server together.
+
+        Args:
+            server_name: Name of the MCP server
+            head: Encoded request without its id (see ``_request_head``)
+            timeout: Seconds to wait for the response
+
+        Returns:
+            The JSON-RPC response message
+
+        Raises:
+            asyncio.TimeoutError: If no response arrives in time
+        """
+        request_id, future = self._start_request(server_name, head)
+        return await self._response(self._pending[server_name], request_id, future, timeout)
+
+    def _start_request(self, server_name: str, head: bytes) -> tuple[int, asyncio.Future]:
+        """
+        Queue a JSON-RPC request without waiting for its response.
+
+        Args:
+            server_name: Name of the MCP server
+            head: Encoded request without its id (see ``_request_head``)
+
+        Returns:
+            The request id and the future its response will resolve
+        """
+        request_id = next(_REQUEST_IDS)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[server_name][request_id] = future
+
+        frame = head + b',"id":' + str(request_id).encode() + b"}\n"
+        self._outbox[server_name].enqueue(frame, request_id)
+        return request_id, future
+
+    async def _response(
+        self,
+        pending: dict[int, asyncio.Future],
+        request_id: int,
+        future: asyncio.Future,
+        timeout: float,
+    ) -> dict[str, Any]:
+        """
+        Wait for the response to a started request.
+
+        Args:
+            pending: The server's in-flight requests
+            request_id: Id of the request
+            future: Future returned by ``_start_request``
+            timeout: Seconds to wait for the response
+
+        Returns:
+            The JSON-RPC response message
+
+        Raises:
+            asyncio.TimeoutError: If no response arrives in time
+        """
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            pending.pop(request_id, None)
+
+    def _notify(self, server_name: str, frame: bytes) -> None:
+        """
+        Queue a JSON-RPC notification (a message without a response).
+
+        Args:
+            server_name: Name of the MCP server
+            frame: Encoded notification, newline-terminated
+        """
+        self._outbox[server_name].enqueue(frame, None)
+
+    async def _reader_loop(self, server_name: str, process: asyncio.subprocess.Process) -> None:
+        """
+        Read JSON-RPC messages from the MCP server and resolve pending requests.
+
+        Args:
+            server_name: Name of the MCP server
+            process: The MCP server process
+        """
         if not process.stdout:
             raise RuntimeError("Process stdout not available")
-        
-        line = await process.stdout.readline()
-        if not line:
-            raise RuntimeError("Received empty response from MCP server")
-        
+
+        pending = self._pending[server_name]
+        debug = logger.isEnabledFor(logging.DEBUG)
         try:
-            response = json.loads(line.decode())
-            logger.debug(f"📥 Received: {response.get('id', response.get('method', 'notification'))}")
-            return response
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to decode JSON-RPC response: {line.decode()}")
-            raise RuntimeError(f"Invalid JSON-RPC response: {e}")
+            while True:
+                try:
+                    line = await process.stdout.readline()
+                except ValueError as e:
+                    # Over the line limit; the caller waiting for it times out
+                    logger.error("Dropped oversized message from %s: %s", server_name, e)
+                    continue
+                if not line:
+                    break
+
+                try:
+                    decoded = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    logger.error("Failed to decode JSON-RPC response: %r", line)
+                    continue
+
+                # Servers may answer with a JSON-RPC batch (array)
+                for response in decoded if isinstance(decoded, list) else (decoded,):
+                    message_id = response.get("id")
+                    if debug:
+                        logger.debug(
+                            "Received: %s", message_id or response.get("method", "notification")
+                        )
+
+                    future = pending.pop(message_id, None) if message_id is not None else None
+                    if future is not None and not future.done():
+                        future.set_result(response)
+        finally:
+            # Fail whatever is still waiting; the server will not answer anymore
+            error = RuntimeError(f"MCP server '{server_name}' closed its output")
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            pending.clear()
 
     def get_all_tools(self) -> list[BaseTool]:
         """
@@ -467,11 +1232,37 @@ class MCPServerManager:
             logger.warning("MCP server manager not initialized. Call initialize() first.")
             return []
 
-        all_tools = []
-        for server_tools in self.tools.values():
-            all_tools.extend(server_tools)
+        return list(itertools.chain.from_iterable(self.tools.values()))
+
+    def iter_all_tools(self) -> Iterator[BaseTool]:
+        """
+        Iterate over all tools from all connected MCP servers without building a list.
+
+        Returns:
+            Iterator over all available tools
+        """
+        return itertools.chain.from_iterable(self.tools.values())
+
+    def describe_tool(self, name: str) -> str | None:
+        """
+        Get the full description and input schema of an MCP tool.
+
+        The LangChain tools only carry a summary of the server's description
+        (see ``description_max_chars``); this returns the complete text.
+
+        Args:
+            name: Full tool name (``<server>_<tool>``)
 
-        return all_tools
+        Returns:
+            Description followed by the JSON input schema, or None if the
+            tool is unknown
+        """
+        description = self.tool_descriptions.get(name)
+        if description is None:
+            return None
+
+        schema = orjson.dumps(self.tool_schemas.get(name, {}), option=orjson.OPT_INDENT_2)
+        return f"{description}\n\nInput schema:\n{schema.decode()}"
 
     def get_tools_by_server(self, server_name: str) -> list[BaseTool]:
         """
@@ -489,16 +1280,83 @@ class MCPServerManager:
         """Shutdown all MCP server connections."""
         logger.info("Shutting down MCP server connections...")
 
-        for server_name, process in self.processes.items():
-            try:
-                process.terminate()
-                await process.wait()
-                logger.info(f"Terminated MCP server: {server_name}")
-            except Exception as e:
-                logger.error(f"Error terminating {server_name}: {e}")
+        background = list(self._background)
+        for task in background:
+            task.cancel()
+        for ready in self._ready.values():
+            ready.set()
+        # Let cancelled connects unwind; their pool references are released below
+        await asyncio.gather(*background, return_exceptions=True)
+
+        retiring = [
+            (server_name, entry)
+            for server_name in list(self._servers)
+            if (entry := self._release(server_name)) is not None
+        ]
+
+        # Processes exit independently, so wait for them together
+        await asyncio.gather(
+            *(self._retire(server_name, entry.spawn) for server_name, entry in retiring)
+        )
 
         self._initialized = False
         self.tools.clear()
+        self.tool_descriptions.clear()
+        self.tool_schemas.clear()
         self.processes.clear()
+        self._servers.clear()
+        self._tool_defs.clear()
+        self._ready.clear()
+        self._pending.clear()
+        self._outbox.clear()
+        self._slots.clear()
 
         logger.info("MCP server connections closed")
+
+    async def _retire(self, server_name: str, spawn: asyncio.Task[_PooledServer]) -> None:
+        """
+        Stop a pooled server that no manager uses anymore.
+
+        A spawn still starting is cancelled; it terminates its own process.
+
+        Args:
+            server_name: Name of the MCP server
+            spawn: The pool entry's spawn task
+        """
+        if not spawn.done():
+            spawn.cancel()
+            await asyncio.wait([spawn])
+        if spawn.cancelled() or spawn.exception() is not None:
+            return
+
+        server = spawn.result()
+        server.close()
+        await self._terminate(server_name, server.process)
+
+    async def _terminate(
+        self, server_name: str, process: asyncio.subprocess.Process, timeout: float = 5.0
+    ) -> None:
+        """
+        Terminate an MCP server process, killing it if it doesn't exit in time.
+
+        Args:
+            server_name: Name of the MCP server
+            process: The MCP server process
+            timeout: Seconds to wait after SIGTERM before sending SIGKILL
+        """
+        try:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=timeout)
+            except TimeoutError:
+                logger.warning(
+                    "MCP server %s did not exit after %.0fs, killing", server_name, timeout
+                )
+                process.kill()
+                await process.wait()
+            logger.info("Terminated MCP server: %s", server_name)
+        except ProcessLookupError:
+            # Already exited
+            pass
+        except Exception as e:
+            logger.error("Error terminating %s: %s", server_name, e)
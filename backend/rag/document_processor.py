@@ -1,9 +1,19 @@
 """Document loading and processing for RAG."""
 
+import io
 import logging
+import multiprocessing
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import cache, partial
+from itertools import chain
 from pathlib import Path
 from typing import BinaryIO
 
+import pypdf
 from langchain_community.document_loaders import (
     PyPDFLoader,
     TextLoader,
@@ -15,6 +25,22 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _text_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """Build a text splitter, reused for every document split in this process."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=["\n\n", "\n", " ", ""],
+    )
+
+
+def _split_one(document: Document, chunk_size: int, chunk_overlap: int) -> list[Document]:
+    """Split a single document; module-level so it can run in a worker process."""
+    return _text_splitter(chunk_size, chunk_overlap).split_documents([document])
+
+
 class DocumentProcessor:
     """
     Process documents for RAG indexing.
@@ -29,6 +55,7 @@ class DocumentProcessor:
         self,
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
+        parallel_threshold: int = 8,
     ) -> None:
         """
         Initialize document processor.
@@ -36,16 +63,18 @@ class DocumentProcessor:
         Args:
             chunk_size: Size of text chunks for splitting
             chunk_overlap: Overlap between consecutive chunks
+            parallel_threshold: Minimum number of documents (e.g. PDF pages)
+                before splitting is spread across worker processes
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.parallel_threshold = parallel_threshold
+
+        self.text_splitter = _text_splitter(chunk_size, chunk_overlap)
 
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""],
-        )
+        # Worker processes for splitting large documents, started on first use
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
 
         # Mapping of file extensions to loader classes
         self.loaders = {
@@ -109,28 +138,92 @@ class DocumentProcessor:
                 f"Unsupported file format: {suffix}. Supported formats: {list(self.loaders.keys())}"
             )
 
-        # For bytes input, we need to write to temporary file
-        # since most loaders expect file paths
+        if suffix == ".docx":
+            documents = self._load_via_tempfile(file_content, suffix)
+        else:
+            # PDF and text are parsed straight from the (spooled) upload; the
+            # raw bytes are never copied into memory or a second file
+            stream = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+            if suffix == ".pdf":
+                documents = self._load_pdf_stream(stream, filename)
+            else:
+                documents = [
+                    Document(
+                        page_content=self._read_text_stream(stream),
+                        metadata={"source": filename},
+                    )
+                ]
+            logger.info(f"Loaded {len(documents)} page(s) from {filename}")
+
+        # Add enhanced metadata
+        upload_timestamp = datetime.now().isoformat()
+        for doc in documents:
+            doc.metadata["source"] = filename
+            doc.metadata["upload_timestamp"] = upload_timestamp
+            # Store normalized filename for duplicate detection
+            doc.metadata["normalized_source"] = Path(filename).name.lower()
+        return documents
+
+    def _load_pdf_stream(self, stream: BinaryIO, filename: str) -> list[Document]:
+        """
+        Parse a PDF from a seekable binary stream into one Document per page.
+
+        Args:
+            stream: PDF file positioned at its start
+            filename: Original filename, stored as the document source
+
+        Returns:
+            List of Document objects with ``source`` and ``page`` metadata
+        """
+        reader = pypdf.PdfReader(stream)
+        return [
+            Document(
+                page_content=page.extract_text(),
+                metadata={"source": filename, "page": i},
+            )
+            for i, page in enumerate(reader.pages)
+        ]
+
+    def _read_text_stream(self, stream: BinaryIO) -> str:
+        """
+        Decode a UTF-8 text file from a binary stream.
+
+        Args:
+            stream: Text file positioned at its start
+
+        Returns:
+            The decoded text, with undecodable bytes replaced
+        """
+        text = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+        try:
+            return text.read()
+        finally:
+            # Leave the caller's file open
+            text.detach()
+
+    def _load_via_tempfile(self, file_content: bytes | BinaryIO, suffix: str) -> list[Document]:
+        """
+        Load a document through a temporary file, for loaders that need a path.
+
+        Args:
+            file_content: File content as bytes or file-like object
+            suffix: File extension, including the dot
+
+        Returns:
+            List of Document objects
+        """
         import tempfile
-        from datetime import datetime
 
         with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp_file:
             if isinstance(file_content, bytes):
                 tmp_file.write(file_content)
             else:
-                tmp_file.write(file_content.read())
+                # Copy in chunks so large uploads are never held in memory
+                shutil.copyfileobj(file_content, tmp_file, 1 << 16)
             tmp_path = tmp_file.name
 
         try:
-            documents = self.load_document(tmp_path)
-            # Add enhanced metadata
-            upload_timestamp = datetime.now().isoformat()
-            for doc in documents:
-                doc.metadata["source"] = filename
-                doc.metadata["upload_timestamp"] = upload_timestamp
-                # Store normalized filename for duplicate detection
-                doc.metadata["normalized_source"] = Path(filename).name.lower()
-            return documents
+            return self.load_document(tmp_path)
         finally:
             # Clean up temporary file
             Path(tmp_path).unlink(missing_ok=True)
@@ -147,12 +240,42 @@ class DocumentProcessor:
         """
         logger.info(f"Splitting {len(documents)} document(s) into chunks...")
 
-        chunks = self.text_splitter.split_documents(documents)
+        if len(documents) < self.parallel_threshold:
+            # Pickling to worker processes costs more than it saves here
+            chunks = self.text_splitter.split_documents(documents)
+        else:
+            split = partial(
+                _split_one, chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
+            )
+            chunks = list(chain.from_iterable(self._get_pool().map(split, documents, chunksize=4)))
 
         logger.info(f"Created {len(chunks)} chunk(s)")
 
         return chunks
 
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Get the splitting process pool, starting it on first use.
+
+        Returns:
+            The shared process pool
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawn rather than fork: the server process runs threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=min(os.cpu_count() or 1, 8),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """Shut down the splitting worker processes, if any were started."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
     def process_document(self, file_path: str | Path) -> list[Document]:
         """
         Load and split a document in one step.
@@ -1,6 +1,9 @@
 """ChromaDB vector store integration."""
 
+import asyncio
+import itertools
 import logging
+import uuid
 from pathlib import Path
 
 from langchain_chroma import Chroma
@@ -35,6 +38,10 @@ class VectorStoreManager:
         self.persist_directory = Path(persist_directory)
         self.collection_name = collection_name
 
+        # Incremented whenever the collection changes, so callers can
+        # invalidate cached search results
+        self.version = 0
+
         # Ensure persist directory exists
         self.persist_directory.mkdir(parents=True, exist_ok=True)
 
@@ -69,11 +76,96 @@ class VectorStoreManager:
         logger.info(f"Adding {len(documents)} document(s) to vector store...")
 
         ids = self.vectorstore.add_documents(documents)
+        self.version += 1
 
         logger.info(f"Successfully added {len(ids)} document(s)")
 
         return ids
 
+    async def aadd_documents(
+        self, documents: list[Document], batch_size: int = 256, max_concurrency: int = 4
+    ) -> list[str]:
+        """
+        Add documents to the vector store, embedding batches concurrently.
+
+        Each batch is embedded with the embedder's async API (up to
+        ``max_concurrency`` requests in flight) and written to Chroma with the
+        precomputed vectors in a worker thread, so Chroma doesn't embed again
+        and writes overlap with the remaining embedding requests.
+
+        Args:
+            documents: List of documents to add
+            batch_size: Number of documents per embedding request
+            max_concurrency: Maximum number of embedding requests in flight
+
+        Returns:
+            List of document IDs
+        """
+        if not documents:
+            logger.warning("No documents to add")
+            return []
+
+        logger.info(f"Adding {len(documents)} document(s) to vector store...")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def add_batch(batch: list[Document]) -> list[str]:
+            texts = [doc.page_content for doc in batch]
+            async with semaphore:
+                embeddings = await self.embeddings.aembed_documents(texts)
+            return await asyncio.to_thread(self._upsert, batch, texts, embeddings)
+
+        try:
+            results = await asyncio.gather(
+                *(
+                    add_batch(documents[start : start + batch_size])
+                    for start in range(0, len(documents), batch_size)
+                )
+            )
+        finally:
+            # Batches written before a failure are in the collection too
+            self.version += 1
+
+        ids = list(itertools.chain.from_iterable(results))
+
+        logger.info(f"Successfully added {len(ids)} document(s)")
+
+        return ids
+
+    def _upsert(
+        self, batch: list[Document], texts: list[str], embeddings: list[list[float]]
+    ) -> list[str]:
+        """
+        Write documents with precomputed embeddings to the Chroma collection.
+
+        Args:
+            batch: Documents to write
+            texts: Page contents of the documents
+            embeddings: Embedding of each document
+
+        Returns:
+            List of document IDs
+        """
+        ids = [doc.id or str(uuid.uuid4()) for doc in batch]
+        metadatas = [doc.metadata for doc in batch]
+        collection = self.vectorstore._collection
+
+        if all(metadatas):
+            collection.upsert(ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas)
+            return ids
+
+        # Chroma rejects empty metadata dicts, so write those documents without metadata
+        for has_metadata in (True, False):
+            indexes = [i for i, metadata in enumerate(metadatas) if bool(metadata) is has_metadata]
+            if indexes:
+                collection.upsert(
+                    ids=[ids[i] for i in indexes],
+                    embeddings=[embeddings[i] for i in indexes],
+                    documents=[texts[i] for i in indexes],
+                    metadatas=[metadatas[i] for i in indexes] if has_metadata else None,
+                )
+        return ids
+
     def similarity_search(
         self, query: str, k: int = 4, filter_dict: dict | None = None
     ) -> list[Document]:
@@ -118,6 +210,52 @@ class VectorStoreManager:
 
         return results
 
+    async def asimilarity_search(
+        self, query: str, k: int = 4, filter_dict: dict | None = None
+    ) -> list[Document]:
+        """
+        Search for similar documents using semantic similarity asynchronously.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter_dict: Optional metadata filter
+
+        Returns:
+            List of similar documents
+        """
+        logger.debug(f"Async similarity search: '{query}' (k={k})")
+
+        results = await self.vectorstore.asimilarity_search(query, k=k, filter=filter_dict)
+
+        logger.debug(f"Found {len(results)} result(s)")
+
+        return results
+
+    async def asimilarity_search_with_score(
+        self, query: str, k: int = 4, filter_dict: dict | None = None
+    ) -> list[tuple[Document, float]]:
+        """
+        Search for similar documents with relevance scores asynchronously.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter_dict: Optional metadata filter
+
+        Returns:
+            List of (document, score) tuples
+        """
+        logger.debug(f"Async similarity search with scores: '{query}' (k={k})")
+
+        results = await self.vectorstore.asimilarity_search_with_score(
+            query, k=k, filter=filter_dict
+        )
+
+        logger.debug(f"Found {len(results)} result(s)")
+
+        return results
+
     def as_retriever(self, **kwargs):
         """
         Get a retriever interface for the vector store.
@@ -135,6 +273,7 @@ class VectorStoreManager:
         logger.warning(f"Deleting collection: {self.collection_name}")
 
         self.vectorstore.delete_collection()
+        self.version += 1
 
         logger.info(f"Collection deleted: {self.collection_name}")
 
@@ -153,13 +292,14 @@ class VectorStoreManager:
         """Clear all documents from the collection."""
         logger.warning("Clearing all documents from vector store...")
 
-        # Get all document IDs and delete them
-        collection = self.vectorstore._collection
-        all_ids = collection.get()["ids"]
+        # Drop and recreate the collection instead of fetching every id to
+        # delete; reset_collection keeps the same Chroma wrapper object
+        count = self.vectorstore._collection.count()
 
-        if all_ids:
-            collection.delete(ids=all_ids)
-            logger.info(f"Cleared {len(all_ids)} document(s)")
+        if count:
+            self.vectorstore.reset_collection()
+            self.version += 1
+            logger.info(f"Cleared {count} document(s)")
         else:
             logger.info("No documents to clear")
 
@@ -224,6 +364,7 @@ class VectorStoreManager:
 
         # Delete the chunks
         collection.delete(ids=ids_to_delete)
+        self.version += 1
 
         logger.info(f"Deleted {len(ids_to_delete)} chunk(s) for {source_filename}")
 
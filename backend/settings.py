@@ -0,0 +1,61 @@
+"""Application settings loaded from environment variables."""
+
+from typing import Annotated
+
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Environment-derived settings, resolved once at import.
+
+    Field names map to upper-case environment variables of the same name
+    (e.g. ``chroma_persist_dir`` reads ``CHROMA_PERSIST_DIR``).
+    """
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+    # Server
+    fastapi_host: str = "localhost"
+    fastapi_port: int = 8000
+    fastapi_threadpool: int = 8
+    cors_origins: Annotated[list[str], NoDecode] = ["*"]
+    log_level: str = "INFO"
+
+    # LangSmith
+    langchain_tracing_v2: str = "true"
+    langchain_project: str = "splunk-mcp-agent"
+    langchain_api_key: str | None = None
+
+    # Agent
+    openai_model: str = "gpt-4o"
+    checkpointer_backend: str = "sqlite"
+    checkpoint_dir: str = "./data/checkpoints"
+    postgres_uri: str | None = None
+
+    # MCP
+    mcp_tool_cache_path: str | None = "./data/mcp-tool-cache.json"
+
+    # RAG
+    chroma_persist_dir: str = "./data/chroma_db"
+    max_upload_bytes: int = 100 * 1024 * 1024
+    max_bulk_upload_bytes: int = 500 * 1024 * 1024
+    index_batch_size: int = 64
+
+    @field_validator("cors_origins", mode="before")
+    @classmethod
+    def _split_origins(cls, value: str | list[str]) -> list[str]:
+        """Parse a comma-separated origin list."""
+        if isinstance(value, str):
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
+
+    @field_validator("checkpointer_backend", mode="after")
+    @classmethod
+    def _lower_backend(cls, value: str) -> str:
+        """Normalize the checkpointer backend name."""
+        return value.lower()
+
+
+settings = Settings()
@@ -8,5 +8,5 @@ fi
 
 # Run the backend
 echo "Starting FastAPI backend..."
-uv run uvicorn backend.main:app --reload --host "${FASTAPI_HOST:-localhost}" --port "${FASTAPI_PORT:-8000}"
+uv run uvicorn backend.main:app --reload --loop uvloop --http httptools --host "${FASTAPI_HOST:-localhost}" --port "${FASTAPI_PORT:-8000}"
 
@@ -0,0 +1,51 @@
+"""Shared fixtures for the backend tests."""
+
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import BaseTool
+
+from backend.agent.batcher import LLMBatcher
+from backend.agent.graph import SplunkMCPAgent
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that replies with a fixed sequence of messages."""
+
+    responses: list[AIMessage]
+    calls: list[list[BaseMessage]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages: list[BaseMessage], *args: Any, **kwargs: Any) -> ChatResult:  # noqa: ARG002
+        self.calls.append(list(messages))
+        return ChatResult(generations=[ChatGeneration(message=self.responses.pop(0))])
+
+
+@pytest.fixture
+def make_agent(monkeypatch: pytest.MonkeyPatch) -> Iterator[Callable[..., SplunkMCPAgent]]:
+    """Build in-memory agents whose model replies with the given messages."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    agents: list[SplunkMCPAgent] = []
+
+    def make(
+        tools: list[BaseTool], responses: list[AIMessage], checkpoint_path: str = ":memory:"
+    ) -> SplunkMCPAgent:
+        agent = SplunkMCPAgent(tools=tools, checkpoint_path=checkpoint_path)
+        agent._batcher = LLMBatcher(ScriptedChatModel(responses=list(responses)))
+        agents.append(agent)
+        return agent
+
+    yield make
+
+    # Stop batcher workers left running on background loops
+    for agent in agents:
+        worker = agent._batcher._worker
+        if worker is not None and not worker.done():
+            worker.get_loop().call_soon_threadsafe(worker.cancel)
@@ -0,0 +1,48 @@
+"""Minimal stdio MCP server used by the server manager tests."""
+
+import json
+import os
+import sys
+import time
+
+TOOLS = [
+    {
+        "name": "echo",
+        "description": "Echo the text back.",
+        "inputSchema": {"type": "object", "properties": {"text": {"type": "string"}}},
+    },
+    {"name": "exit", "description": "Exit without answering.", "inputSchema": {}},
+]
+
+
+def main() -> None:
+    # Tests use these to observe the process and to slow down its handshake
+    if pid_file := os.environ.get("FAKE_MCP_PID_FILE"):
+        with open(pid_file, "w") as f:
+            f.write(str(os.getpid()))
+    delay = float(os.environ.get("FAKE_MCP_INIT_DELAY", "0"))
+
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" not in message:
+            continue
+
+        method = message["method"]
+        if method == "initialize":
+            time.sleep(delay)
+            result = {"protocolVersion": "2024-11-05", "capabilities": {}}
+        elif method == "tools/list":
+            result = {"tools": TOOLS}
+        elif message["params"]["name"] == "exit":
+            return
+        else:
+            text = message["params"]["arguments"].get("text", "")
+            result = {"content": [{"type": "text", "text": text}]}
+
+        sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}))
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
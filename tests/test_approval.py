@@ -0,0 +1,133 @@
+"""Tests for the human-in-the-loop approval flow."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+
+from backend.agent.graph import NoPendingApprovalError
+
+calls: list[tuple[str, str]] = []
+
+
+@tool("splunk-mcp_run_splunk_query")
+async def run_splunk_query(query: str) -> str:
+    """Run a Splunk query."""
+    calls.append(("splunk", query))
+    return f"results for {query}"
+
+
+@tool("db-mcp_execute_sql")
+async def execute_sql(sql: str) -> str:
+    """Execute SQL."""
+    calls.append(("sql", sql))
+    return f"ran {sql}"
+
+
+def _request(name: str, args: dict, call_id: str = "call_1") -> AIMessage:
+    return AIMessage("", tool_calls=[{"name": name, "args": args, "id": call_id}])
+
+
+def _review_then_resume(agent, decisions: list[dict]) -> tuple[dict, dict]:
+    async def scenario():
+        paused = await agent.ainvoke("do it", "thread-1")
+        resumed = await agent.resume("thread-1", decisions)
+        return paused, resumed
+
+    calls.clear()
+    return asyncio.run(scenario())
+
+
+def test_sensitive_call_waits_for_approval(make_agent):
+    agent = make_agent(
+        [execute_sql],
+        [_request("db-mcp_execute_sql", {"sql": "select 1"}), AIMessage("done")],
+    )
+
+    paused, resumed = _review_then_resume(agent, [{"type": "approve"}])
+
+    assert paused["pending_approval"] is True
+    [action] = paused["approval_request"]["action_requests"]
+    assert action["tool_name"] == "db-mcp_execute_sql"
+    assert action["arguments"] == {"sql": "select 1"}
+    assert calls == [("sql", "select 1")]
+    assert resumed["pending_approval"] is False
+    assert resumed["approval_request"] is None
+    assert resumed["messages"][-2].content == "ran select 1"
+    assert resumed["messages"][-1].content == "done"
+
+
+def test_rejected_call_is_not_executed(make_agent):
+    agent = make_agent([execute_sql], [_request("db-mcp_execute_sql", {"sql": "drop table t"})])
+
+    _, resumed = _review_then_resume(agent, [{"type": "reject"}])
+
+    assert calls == []
+    rejection, reply = resumed["messages"][-2:]
+    assert isinstance(rejection, ToolMessage)
+    assert rejection.status == "error"
+    assert reply.content == "The requested operation was rejected by human review."
+    assert resumed["pending_approval"] is False
+
+
+def test_edited_arguments_are_used(make_agent):
+    agent = make_agent(
+        [execute_sql],
+        [_request("db-mcp_execute_sql", {"sql": "select *"}), AIMessage("done")],
+    )
+
+    _, resumed = _review_then_resume(
+        agent, [{"type": "edit", "edited_arguments": {"sql": "select 1"}}]
+    )
+
+    assert calls == [("sql", "select 1")]
+    request = next(m for m in resumed["messages"] if isinstance(m, AIMessage) and m.tool_calls)
+    assert request.tool_calls[0]["args"] == {"sql": "select 1"}
+
+
+def test_speculative_result_is_reused_on_approval(make_agent):
+    agent = make_agent(
+        [run_splunk_query],
+        [_request("splunk-mcp_run_splunk_query", {"query": "index=main"}), AIMessage("done")],
+    )
+
+    _, resumed = _review_then_resume(agent, [{"type": "approve"}])
+
+    # Started during review and not run a second time after approval
+    assert calls == [("splunk", "index=main")]
+    assert resumed["messages"][-2].content == "results for index=main"
+    assert resumed["messages"][-1].content == "done"
+
+
+def test_speculative_result_is_discarded_on_edit(make_agent):
+    agent = make_agent(
+        [run_splunk_query],
+        [_request("splunk-mcp_run_splunk_query", {"query": "index=*"}), AIMessage("done")],
+    )
+
+    _, resumed = _review_then_resume(
+        agent, [{"type": "edit", "edited_arguments": {"query": "index=main"}}]
+    )
+
+    assert resumed["messages"][-2].content == "results for index=main"
+    assert [m.content for m in resumed["messages"] if isinstance(m, ToolMessage)] == [
+        "results for index=main"
+    ]
+
+
+def test_resume_without_pending_approval_is_rejected(make_agent):
+    agent = make_agent(
+        [execute_sql],
+        [_request("db-mcp_execute_sql", {"sql": "select 1"}), AIMessage("done")],
+    )
+
+    _review_then_resume(agent, [{"type": "approve"}])
+
+    # A repeated decision must not re-run the model or touch the thread
+    with pytest.raises(NoPendingApprovalError):
+        asyncio.run(agent.resume("thread-1", [{"type": "approve"}]))
+
+    state = asyncio.run(agent.aget_state("thread-1"))
+    assert state.values["approval_decision"] is None
+    assert state.values["messages"][-1].content == "done"
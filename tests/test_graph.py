@@ -0,0 +1,148 @@
+"""Tests for the LangGraph agent."""
+
+import asyncio
+import gc
+import threading
+import weakref
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from backend.agent.graph import SplunkMCPAgent
+
+
+@tool
+def echo(value: str) -> str:
+    """Return the value."""
+    return value
+
+
+def test_agents_sharing_tools_keep_their_own_graph(make_agent):
+    first = make_agent([echo], [AIMessage("from first")])
+    second = make_agent([echo], [AIMessage("from second")])
+
+    assert first.llm_with_tools is second.llm_with_tools
+    assert first.graph is not second.graph
+
+    result = asyncio.run(second.ainvoke("hi", "thread-1"))
+
+    assert result["messages"][-1].content == "from second"
+    config = {"configurable": {"thread_id": "thread-1"}}
+    assert second.checkpointer.get_tuple(config) is not None
+    assert first.checkpointer.get_tuple(config) is None
+
+
+def test_invoke_can_be_called_repeatedly(make_agent):
+    agent = make_agent(
+        [echo],
+        [
+            AIMessage("", tool_calls=[{"name": "echo", "args": {"value": "x"}, "id": "call_1"}]),
+            AIMessage("first"),
+            AIMessage("second"),
+        ],
+    )
+
+    first = agent.invoke("hi", "thread-1")
+    second = agent.invoke("again", "thread-1")
+
+    assert first["messages"][-2].content == "x"
+    assert first["messages"][-1].content == "first"
+    assert second["messages"][-1].content == "second"
+    assert len(second["messages"]) == len(first["messages"]) + 2
+
+
+def test_invoke_runs_on_the_agents_own_loop(make_agent, tmp_path):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def build():
+        agent = make_agent(
+            [echo],
+            [AIMessage("first"), AIMessage("second")],
+            checkpoint_path=str(tmp_path / "agent.db"),
+        )
+        await agent.setup()
+        return agent
+
+    agent = asyncio.run_coroutine_threadsafe(build(), loop).result()
+    try:
+        assert agent.invoke("hi", "thread-1")["messages"][-1].content == "first"
+        assert agent.invoke("again", "thread-1")["messages"][-1].content == "second"
+    finally:
+        asyncio.run_coroutine_threadsafe(agent.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        # Stop the batcher's worker before closing the loop
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.close()
+
+
+def test_invoke_rejects_running_loop(make_agent):
+    agent = make_agent([echo], [])
+
+    async def call_invoke():
+        agent.invoke("hi", "thread-1")
+
+    with pytest.raises(RuntimeError, match="ainvoke"):
+        asyncio.run(call_invoke())
+
+
+def test_set_tools_rebinds_the_agent(make_agent):
+    @tool
+    def shout(value: str) -> str:
+        """Return the value in upper case."""
+        return value.upper()
+
+    agent = make_agent(
+        [echo],
+        [
+            AIMessage("", tool_calls=[{"name": "shout", "args": {"value": "x"}, "id": "c1"}]),
+            AIMessage("done"),
+        ],
+    )
+    graph, llm_with_tools, batcher = agent.graph, agent.llm_with_tools, agent._batcher
+
+    agent.set_tools([echo, shout])
+    # Keep the scripted model instead of the newly bound one
+    agent._batcher = batcher
+
+    assert agent.graph is not graph
+    assert agent.llm_with_tools is not llm_with_tools
+    assert [t["function"]["name"] for t in agent.llm_with_tools.kwargs["tools"]] == [
+        "echo",
+        "shout",
+    ]
+    result = asyncio.run(agent.ainvoke("hi", "thread-1"))
+    assert result["messages"][-2].content == "X"
+
+
+def test_cached_llm_keeps_its_tools_alive(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+
+    @tool
+    def whisper(value: str) -> str:
+        """Return the value in lower case."""
+        return value.lower()
+
+    agent = SplunkMCPAgent(tools=[whisper], checkpoint_path=":memory:")
+    llm_with_tools = agent.llm_with_tools
+    ref = weakref.ref(whisper)
+    del whisper, agent
+    gc.collect()
+
+    # A new tool set can't reuse the ids of tools held by a cache entry
+    assert ref() is not None
+
+    @tool
+    def whisper(value: str) -> str:  # noqa: F811
+        """Return the value in lower case."""
+        return value.lower()
+
+    assert (
+        SplunkMCPAgent(tools=[whisper], checkpoint_path=":memory:").llm_with_tools
+        is not llm_with_tools
+    )
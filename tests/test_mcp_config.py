@@ -0,0 +1,91 @@
+"""Tests for the MCP server configuration loader."""
+
+import os
+
+import orjson
+import pytest
+
+from backend.mcp.config import _CONFIG_CACHE, _substitute_env, load_mcp_config
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    _CONFIG_CACHE.clear()
+    yield
+    _CONFIG_CACHE.clear()
+
+
+def _write(path, args: list[str], **server) -> None:
+    config = {"mcpServers": {"splunk": {"command": "npx", "args": args, **server}}}
+    path.write_bytes(orjson.dumps(config))
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("plain", "plain"),
+        ("$HOST", "splunk.local"),
+        ("https://${HOST}:8089", "https://splunk.local:8089"),
+        ("$HOST_suffix", "$HOST_suffix"),
+        ("${MISSING}", "${MISSING}"),
+        ("$$HOST", "$HOST"),
+        ("cost: $5", "cost: $5"),
+    ],
+)
+def test_substitute_env(monkeypatch, value, expected):
+    monkeypatch.setenv("HOST", "splunk.local")
+    monkeypatch.delenv("MISSING", raising=False)
+    monkeypatch.delenv("HOST_suffix", raising=False)
+
+    assert _substitute_env(value) == expected
+
+
+def test_load_substitutes_args(monkeypatch, tmp_path):
+    monkeypatch.setenv("SPLUNK_URL", "https://splunk.local")
+    path = tmp_path / "mcp.json"
+    _write(path, ["mcp-remote", "${SPLUNK_URL}/mcp"], env={"TOKEN": "$SPLUNK_URL"})
+
+    server = load_mcp_config(path).mcpServers["splunk"]
+
+    assert server.args == ["mcp-remote", "https://splunk.local/mcp"]
+    # Only args are substituted
+    assert server.env == {"TOKEN": "$SPLUNK_URL"}
+
+
+def test_load_is_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / "mcp.json"
+    _write(path, ["first"])
+
+    config = load_mcp_config(path)
+    assert load_mcp_config(path) is config
+
+    _write(path, ["second", "version"])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = load_mcp_config(path)
+    assert reloaded is not config
+    assert reloaded.mcpServers["splunk"].args == ["second", "version"]
+    # Only the latest version of the file stays cached
+    assert len(_CONFIG_CACHE) == 1
+
+
+def test_enabled_servers(tmp_path):
+    path = tmp_path / "mcp.json"
+    path.write_bytes(
+        orjson.dumps(
+            {
+                "mcpServers": {
+                    "on": {"command": "npx", "args": []},
+                    "off": {"command": "npx", "args": [], "enabled": False},
+                }
+            }
+        )
+    )
+
+    assert list(load_mcp_config(path).enabled_servers) == ["on"]
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_mcp_config(tmp_path / "missing.json")
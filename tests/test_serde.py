@@ -0,0 +1,93 @@
+"""Tests for the orjson checkpoint serializer."""
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from backend.agent.serde import OrjsonSerializer
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Color(Enum):
+    RED = "red"
+
+
+def _round_trip(serde: Any, value: Any) -> Any:
+    return serde.loads_typed(serde.dumps_typed(value))
+
+
+def _rich_checkpoint() -> dict[str, Any]:
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {
+        "messages": [HumanMessage("hi")],
+        "point": Point(1, 2),
+        "when": datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC),
+        "pair": (1, 2),
+    }
+    checkpoint["channel_versions"] = dict.fromkeys(checkpoint["channel_values"], 1)
+    return checkpoint
+
+
+def test_plain_checkpoint_uses_orjson():
+    serde = OrjsonSerializer()
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {
+        "messages": [HumanMessage("hi"), AIMessage("hello", id="ai-1")],
+        "pending_approval": False,
+        "approval_request": None,
+    }
+
+    type_, payload = serde.dumps_typed(checkpoint)
+
+    assert type_ == "orjson"
+    assert serde.loads_typed((type_, payload)) == checkpoint
+
+
+def test_checkpoint_with_rich_values_matches_langgraph_serializer():
+    serde = OrjsonSerializer()
+    checkpoint = _rich_checkpoint()
+
+    assert serde.dumps_typed(checkpoint)[0] != "orjson"
+    restored = _round_trip(serde, checkpoint)
+
+    assert restored == _round_trip(JsonPlusSerializer(), checkpoint)
+    assert restored["channel_values"]["point"] == Point(1, 2)
+    assert restored["channel_values"]["when"] == checkpoint["channel_values"]["when"]
+
+
+def test_values_orjson_would_change_fall_back():
+    serde = OrjsonSerializer()
+    upstream = JsonPlusSerializer()
+    for value in ({1: "int key"}, uuid4(), Color.RED, [("nested", "tuple")], {"__lc_message__": 1}):
+        assert serde.dumps_typed(value)[0] != "orjson", value
+        assert _round_trip(serde, value) == _round_trip(upstream, value), value
+
+    assert serde.dumps_typed(float("nan"))[0] != "orjson"
+
+
+def test_memory_saver_round_trip():
+    saver = MemorySaver(serde=OrjsonSerializer())
+    config = {"configurable": {"thread_id": "t-1", "checkpoint_ns": ""}}
+    checkpoint = _rich_checkpoint()
+
+    saved = saver.put(
+        config, checkpoint, {"source": "input", "step": -1}, checkpoint["channel_versions"]
+    )
+    restored = saver.get_tuple(saved).checkpoint
+
+    expected = _round_trip(JsonPlusSerializer(), checkpoint["channel_values"])
+    assert restored["channel_values"] == expected
+    assert isinstance(restored["channel_values"]["point"], Point)
+    assert isinstance(restored["channel_values"]["when"], datetime)
@@ -0,0 +1,196 @@
+"""Tests for the MCP server manager's stdio transport and process pool."""
+
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+
+from backend.mcp.config import MCPConfig
+from backend.mcp.server_manager import MCPServerManager, _config_fingerprint
+
+FAKE_SERVER = str(Path(__file__).with_name("fake_mcp_server.py"))
+
+
+def _config(**settings) -> MCPConfig:
+    server = {"command": sys.executable, "args": [FAKE_SERVER], **settings}
+    return MCPConfig(mcpServers={"fake": server})
+
+
+def test_tools_are_listed_and_called():
+    async def scenario():
+        manager = MCPServerManager(_config())
+        await manager.initialize()
+        try:
+            assert [t.name for t in manager.get_all_tools()] == ["fake_echo", "fake_exit"]
+            tool = manager.get_tools_by_server("fake")[0]
+            results = await asyncio.gather(*(tool.ainvoke({"text": str(i)}) for i in range(20)))
+            assert results == [str(i) for i in range(20)]
+        finally:
+            await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_managers_share_a_process_until_the_last_shuts_down():
+    async def scenario():
+        config = _config(write_coalesce_us=50_000)
+        first, second = MCPServerManager(config), MCPServerManager(config)
+        await first.initialize()
+        await second.initialize()
+
+        process = first.processes["fake"]
+        assert second.processes["fake"] is process
+        entry = first._servers["fake"][1]
+        assert entry.refcount == 2
+
+        # Both calls land in the same coalesced write, scheduled by the first
+        # manager; shutting it down must not strand the second one's frame
+        first_call = asyncio.create_task(first._execute_mcp_tool("fake", "echo", {"text": "a"}))
+        await asyncio.sleep(0)
+        second_call = asyncio.create_task(second._execute_mcp_tool("fake", "echo", {"text": "b"}))
+        await asyncio.sleep(0)
+        await first.shutdown()
+
+        assert entry.refcount == 1
+        assert process.returncode is None
+        assert await asyncio.wait_for(second_call, timeout=5) == "b"
+        assert await first_call == "a"
+
+        await second.shutdown()
+        assert process.returncode is not None
+
+    asyncio.run(scenario())
+
+
+def test_conflicting_settings_get_their_own_process():
+    async def scenario():
+        first = MCPServerManager(_config())
+        second = MCPServerManager(_config(max_in_flight=2))
+        await first.initialize()
+        await second.initialize()
+        try:
+            assert first.processes["fake"] is not second.processes["fake"]
+            assert "fake" not in first._slots
+            assert "fake" in second._slots
+        finally:
+            await first.shutdown()
+            await second.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_large_frames_are_flushed_immediately(caplog):
+    async def scenario():
+        manager = MCPServerManager(_config(write_coalesce_us=50_000))
+        await manager.initialize()
+        try:
+            text = "x" * 20_000
+            result = await manager._execute_mcp_tool("fake", "echo", {"text": text}, timeout=5)
+            assert result == text
+        finally:
+            await manager.shutdown()
+
+    with caplog.at_level(logging.ERROR):
+        asyncio.run(scenario())
+
+    assert not [r for r in caplog.records if r.levelno >= logging.ERROR]
+
+
+def test_pending_calls_fail_when_the_server_exits():
+    async def scenario():
+        manager = MCPServerManager(_config())
+        await manager.initialize()
+        try:
+            result = await manager._execute_mcp_tool("fake", "exit", {}, timeout=5)
+            assert "closed its output" in result
+        finally:
+            await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def _write_tool_cache(path: Path, config: MCPConfig, tools: list[dict]) -> None:
+    fingerprint = _config_fingerprint(config.mcpServers["fake"])
+    path.write_bytes(orjson.dumps({"fake": {"fingerprint": fingerprint, "tools": tools}}))
+
+
+def test_shutdown_stops_a_server_that_is_still_starting(tmp_path):
+    pid_file = tmp_path / "pid"
+    config = _config(env={"FAKE_MCP_PID_FILE": str(pid_file), "FAKE_MCP_INIT_DELAY": "30"})
+    cache_path = tmp_path / "tools.json"
+    _write_tool_cache(cache_path, config, [{"name": "echo", "inputSchema": {}}])
+
+    async def scenario():
+        manager = MCPServerManager(config, tool_cache_path=cache_path)
+        await manager.initialize()
+        assert [t.name for t in manager.get_all_tools()] == ["fake_echo"]
+
+        for _ in range(100):
+            if pid_file.exists() and pid_file.read_text():
+                break
+            await asyncio.sleep(0.05)
+        pid = int(pid_file.read_text())
+
+        await asyncio.wait_for(manager.shutdown(), timeout=10)
+        return pid
+
+    pid = asyncio.run(scenario())
+
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_tool_refresh_notifies_listeners(tmp_path):
+    config = _config()
+    cache_path = tmp_path / "tools.json"
+    _write_tool_cache(cache_path, config, [{"name": "echo", "inputSchema": {}}])
+
+    async def scenario():
+        manager = MCPServerManager(config, tool_cache_path=cache_path)
+        await manager.initialize()
+        try:
+            generation = manager.tools_generation
+            seen: list[list[str]] = []
+            manager.add_tools_listener(
+                lambda: seen.append([t.name for t in manager.get_all_tools()])
+            )
+
+            await asyncio.wait_for(manager._ready["fake"].wait(), timeout=10)
+
+            assert seen == [["fake_echo", "fake_exit"]]
+            assert manager.tools_generation == generation + 1
+            assert manager.describe_tool("fake_exit") is not None
+        finally:
+            await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_unchanged_tools_are_kept_after_connecting(tmp_path):
+    config = _config()
+    cache_path = tmp_path / "tools.json"
+
+    async def scenario():
+        # First run fills the tool cache
+        manager = MCPServerManager(config, tool_cache_path=cache_path)
+        await manager.initialize()
+        await manager.shutdown()
+
+        manager = MCPServerManager(config, tool_cache_path=cache_path)
+        await manager.initialize()
+        try:
+            tools = manager.get_all_tools()
+            generation = manager.tools_generation
+            await asyncio.wait_for(manager._ready["fake"].wait(), timeout=10)
+
+            assert manager.get_all_tools() == tools
+            assert manager.tools_generation == generation
+            assert await tools[0].ainvoke({"text": "hi"}) == "hi"
+        finally:
+            await manager.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,142 @@
+"""Tests for the concurrent tool execution node."""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+
+from backend.agent.tool_node import ParallelToolNode
+
+
+def _state(*tool_calls: dict) -> dict:
+    calls = [{"type": "tool_call", **call} for call in tool_calls]
+    return {"messages": [HumanMessage("hi"), AIMessage(content="", tool_calls=calls)]}
+
+
+def test_independent_calls_run_concurrently():
+    running = 0
+    peak = 0
+
+    @tool
+    async def slow(value: str) -> str:
+        """Return the value after a short delay."""
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return value
+
+    node = ParallelToolNode([slow], max_concurrency=2)
+    state = _state(
+        {"name": "slow", "args": {"value": "a"}, "id": "call_a"},
+        {"name": "slow", "args": {"value": "b"}, "id": "call_b"},
+        {"name": "slow", "args": {"value": "c"}, "id": "call_c"},
+    )
+
+    result = asyncio.run(node(state, {}))
+
+    assert [m.content for m in result["messages"]] == ["a", "b", "c"]
+    assert peak == 2
+
+
+def test_dependent_call_waits_for_its_layer():
+    order: list[str] = []
+
+    @tool
+    async def echo(value: str) -> str:
+        """Return the value."""
+        order.append(value)
+        return value.upper()
+
+    node = ParallelToolNode([echo])
+    state = _state(
+        {"name": "echo", "args": {"value": "${call_a.output}!"}, "id": "call_b"},
+        {"name": "echo", "args": {"value": "first"}, "id": "call_a"},
+    )
+
+    assert [
+        [c["id"] for c in layer] for layer in node._layer(state["messages"][-1].tool_calls)
+    ] == [
+        ["call_a"],
+        ["call_b"],
+    ]
+
+    result = asyncio.run(node(state, {}))
+
+    assert order == ["first", "FIRST!"]
+    assert [m.tool_call_id for m in result["messages"]] == ["call_b", "call_a"]
+    assert result["messages"][0].content == "FIRST!"
+
+
+def test_circular_dependencies_run_sequentially():
+    @tool
+    def echo(value: str) -> str:
+        """Return the value."""
+        return value
+
+    node = ParallelToolNode([echo])
+    calls = _state(
+        {"name": "echo", "args": {"value": "call_b"}, "id": "call_a"},
+        {"name": "echo", "args": {"value": "call_a"}, "id": "call_b"},
+    )["messages"][-1].tool_calls
+
+    assert [[c["id"] for c in layer] for layer in node._layer(calls)] == [["call_a"], ["call_b"]]
+
+
+def test_already_answered_calls_are_skipped_and_errors_reported():
+    @tool
+    def echo(value: str) -> str:
+        """Return the value."""
+        return value
+
+    node = ParallelToolNode([echo])
+    state = _state(
+        {"name": "echo", "args": {"value": "done"}, "id": "call_a"},
+        {"name": "missing", "args": {}, "id": "call_b"},
+    )
+    state["messages"].append(ToolMessage("speculative", tool_call_id="call_a"))
+
+    result = asyncio.run(node(state, {}))
+
+    assert len(result["messages"]) == 1
+    assert result["messages"][0].tool_call_id == "call_b"
+    assert result["messages"][0].status == "error"
+
+
+def test_config_reaches_tools():
+    seen: list[str] = []
+
+    @tool
+    async def whoami(config: RunnableConfig) -> str:
+        """Return the thread id from the run config."""
+        seen.append(config["configurable"]["thread_id"])
+        return "ok"
+
+    node = ParallelToolNode([whoami])
+    state = _state({"name": "whoami", "args": {}, "id": "call_a"})
+
+    asyncio.run(node(state, {"configurable": {"thread_id": "t-1"}}))
+
+    assert seen == ["t-1"]
+
+
+def test_node_is_reusable_across_event_loops():
+    @tool
+    async def echo(value: str) -> str:
+        """Return the value."""
+        await asyncio.sleep(0)
+        return value
+
+    node = ParallelToolNode([echo], max_concurrency=1)
+    state = _state(
+        {"name": "echo", "args": {"value": "a"}, "id": "call_a"},
+        {"name": "echo", "args": {"value": "b"}, "id": "call_b"},
+    )
+
+    for _ in range(2):
+        result = asyncio.run(node(state, {}))
+        assert [m.content for m in result["messages"]] == ["a", "b"]
+
+    assert len(node._semaphores) == 1